@@ -1,10 +1,11 @@
 """HTTP API server for terminal AI chat app."""
 
+import hashlib
 import json
 import uuid
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -14,16 +15,21 @@ from core.database import Database, Provider, Model, Agent, Session, Message, AP
 class APIHandler(BaseHTTPRequestHandler):
     """HTTP API request handler."""
 
+    # HTTP/1.1 keeps client connections open between requests.
+    protocol_version = "HTTP/1.1"
+
     def log_message(self, format, *args):
         """Suppress default logging."""
         pass
 
     def send_json(self, status: int, data: Dict):
         """Send JSON response."""
+        body = json.dumps(data).encode()
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
     def get_json(self) -> Dict:
         """Read JSON from request body."""
@@ -61,9 +67,11 @@ class APIHandler(BaseHTTPRequestHandler):
         elif path == '/api-logs':
             self.handle_api_logs()
         elif path == '/screen':
-            self.handle_get_screen()
+            self.handle_get_screen(parse_qs(urlparse(self.path).query).get('since', [None])[0])
         elif path == '/state':
             self.handle_get_state()
+        elif path == '/snapshot':
+            self.handle_get_snapshot()
         else:
             self.send_json(404, {'error': 'Not found'})
 
@@ -425,9 +433,14 @@ class APIHandler(BaseHTTPRequestHandler):
         })
 
     def handle_keystrokes(self, data: Dict):
-        """Send multiple keystrokes to the TUI."""
+        """Send multiple keystrokes to the TUI.
+
+        With 'trace' set, each result also carries the TUI state once that
+        key has been handled.
+        """
         keys = data.get('keys', [])
         delay = data.get('delay', 0.1)
+        trace = data.get('trace', False)
 
         if not keys:
             self.send_json(400, {'error': 'keys required'})
@@ -441,24 +454,49 @@ class APIHandler(BaseHTTPRequestHandler):
         results = []
         for key in keys:
             success = app.ui.inject_key(key)
-            results.append({'key': key, 'success': success})
+            result = {'key': key, 'success': success}
+            results.append(result)
             time.sleep(delay)
+            if trace:
+                self.wait_for_key_queue(app)
+                result['state'] = app.ui.get_state()
 
         self.send_json(200, {
             'results': results,
             'timestamp': datetime.now().isoformat()
         })
 
-    def handle_get_screen(self):
-        """Get current screen contents."""
+    def wait_for_key_queue(self, app, timeout: float = 1.0):
+        """Wait until the TUI has taken every injected key off its queue."""
+        deadline = time.monotonic() + timeout
+        while app.ui.key_queue and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def handle_get_screen(self, since: Optional[str] = None):
+        """Get current screen contents.
+
+        screen_version is a hash of the screen text. A client passing the
+        version it already has as ?since= gets 'unchanged' without the text
+        when the screen has not changed.
+        """
         app = self.get_app()
         if not app or not hasattr(app, 'ui') or not app.ui:
             self.send_json(503, {'error': 'TUI not running'})
             return
 
         screen_text = app.ui.get_screen_text()
+        version = hashlib.blake2b(screen_text.encode(), digest_size=8).hexdigest()
+        if since == version:
+            self.send_json(200, {
+                'unchanged': True,
+                'screen_version': version,
+                'timestamp': datetime.now().isoformat()
+            })
+            return
+
         self.send_json(200, {
             'screen': screen_text,
+            'screen_version': version,
             'timestamp': datetime.now().isoformat()
         })
 
@@ -475,6 +513,21 @@ class APIHandler(BaseHTTPRequestHandler):
             'timestamp': datetime.now().isoformat()
         })
 
+    def handle_get_snapshot(self):
+        """Get screen contents and TUI state in one response."""
+        app = self.get_app()
+        if not app or not hasattr(app, 'ui') or not app.ui:
+            self.send_json(503, {'error': 'TUI not running'})
+            return
+
+        screen_text = app.ui.get_screen_text()
+        self.send_json(200, {
+            'screen': screen_text,
+            'screen_version': hashlib.blake2b(screen_text.encode(), digest_size=8).hexdigest(),
+            'state': app.ui.get_state(),
+            'timestamp': datetime.now().isoformat()
+        })
+
     def handle_run_schedule(self, data: Dict):
         """Run a scheduled task manually."""
         schedule_id = data.get('schedule_id')
@@ -494,8 +547,12 @@ class APIHandler(BaseHTTPRequestHandler):
         })
 
 
-class APIServer(HTTPServer):
-    """HTTP API server with database and app reference."""
+class APIServer(ThreadingHTTPServer):
+    """HTTP API server with database and app reference.
+
+    Each connection gets its own thread, so a client holding a keep-alive
+    connection open does not block other clients.
+    """
 
     def __init__(self, host: str, port: int, db: Database, app=None):
         super().__init__((host, port), APIHandler)
@@ -11,7 +11,7 @@ from dataclasses import asdict
 
 from core.database import Database, Provider, Model, Agent, Session, Message, Tool, Schedule, APILog
 from core.config import AppConfig
-from core.ui import UITerminal
+from core.ui import UITerminal, FRAME_INTERVAL_MS
 
 from providers.base import Provider as BaseProvider
 from providers.openai import OpenAIProvider
@@ -263,19 +263,14 @@ class TerminalAIApp:
     
     def _main_loop(self):
         """Main application loop."""
-        self.ui.stdscr.nodelay(True)
-        timeout_ms = 100
-
         while True:
             self._render()
 
-            key = self.ui.stdscr.getch()
+            # Block for at most one frame instead of spinning on nodelay getch.
+            key = self.ui.read_key(timeout_ms=FRAME_INTERVAL_MS)
 
             if key == curses.ERR:
-                if self.ui.key_queue:
-                    key = self.ui.key_queue.pop(0)
-                else:
-                    continue
+                continue
 
             if key == ord('/'):
                 self._handle_command()
@@ -307,8 +302,6 @@ class TerminalAIApp:
     
     def _render(self):
         """Render UI."""
-        self.ui.clear()
-        
         if self.current_session:
             messages = self.db.get_messages(self.current_session.id)
             self.ui.chat_panel.clear_chat()
@@ -335,7 +328,7 @@ class TerminalAIApp:
                         stats[key] = 0
                 self.ui.transparency_panel.update_stats(stats)
             
-            recent_logs = self.db.get_recent_api_logs(20)
+            recent_logs = self.db.get_api_logs_summary(limit=20)
             for log in recent_logs:
                 self.ui.transparency_panel.add_api_log({
                     "provider_name": log.provider_name,
@@ -345,8 +338,7 @@ class TerminalAIApp:
                     "ttft_ms": log.ttft_ms,
                     "tokens_in": log.tokens_in,
                     "tokens_out": log.tokens_out,
-                    "cost": log.cost,
-                    "error": log.error
+                    "cost": log.cost
                 })
         
         status_left = f"Session: {self.current_session.name if self.current_session else 'None'}"
@@ -445,7 +437,7 @@ class TerminalAIApp:
         messages.append({"role": "user", "content": content})
         
         self.ui.chat_panel.add_message("user", content)
-        self.ui.render()
+        self.ui.render(force=True)
         
         import time
         start_time = time.time()
@@ -561,9 +553,7 @@ class TerminalAIApp:
     def _clear_chat(self):
         """Clear chat history."""
         if self.current_session:
-            with self.db.get_connection() as conn:
-                conn.execute("DELETE FROM messages WHERE session_id = ?", (self.current_session.id,))
-                conn.commit()
+            self.db.clear_messages(self.current_session.id)
             self.ui.chat_panel.clear_chat()
     
     def _create_new_session(self):
@@ -4,12 +4,80 @@ import sqlite3
 import json
 import uuid
 import os
+import zlib
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, replace
 from contextlib import contextmanager
 
 
+SCHEMA_VERSION = 1
+
+# Columns holding UUIDs, stored as 16-byte BLOBs instead of 36-char TEXT.
+_ID_COLUMNS = {
+    "providers": ("id",),
+    "models": ("id",),
+    "agents": ("id",),
+    "sessions": ("id", "agent_id"),
+    "messages": ("id", "session_id"),
+    "tools": ("id",),
+    "schedules": ("id", "agent_id"),
+    "api_logs": ("id", "session_id"),
+}
+
+
+def _pack_id(value: Optional[str]) -> Optional[Any]:
+    """Convert a UUID string to its 16-byte form for storage."""
+    if value is None:
+        return None
+    try:
+        return uuid.UUID(value).bytes
+    except (ValueError, AttributeError, TypeError):
+        return value
+
+
+def _unpack_id(value: Any) -> Any:
+    """Convert a stored 16-byte UUID back to its string form."""
+    if isinstance(value, bytes) and len(value) == 16:
+        return str(uuid.UUID(bytes=value))
+    return value
+
+
+# JSON payload columns, stored zlib-compressed once they pass the threshold.
+_PAYLOAD_COLUMNS = ("tool_calls", "tool_results", "request_data", "response_data")
+_COMPRESS_MIN_BYTES = 512
+
+
+def _pack_payload(value: Optional[str]) -> Optional[Any]:
+    """Compress a large serialized payload into a BLOB; small ones stay TEXT."""
+    if value is None:
+        return None
+    data = value.encode("utf-8")
+    if len(data) < _COMPRESS_MIN_BYTES:
+        return value
+    return zlib.compress(data)
+
+
+def _unpack_payload(value: Any) -> Any:
+    """Inflate a payload stored by _pack_payload."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def _from_row(cls, row: sqlite3.Row):
+    """Build a model instance from a row, unpacking UUID and payload columns."""
+    data = dict(row)
+    for column in ("id", "session_id", "agent_id"):
+        if column in data:
+            data[column] = _unpack_id(data[column])
+    for column in _PAYLOAD_COLUMNS:
+        if column in data:
+            data[column] = _unpack_payload(data[column])
+    return cls(**data)
+
+
 @dataclass
 class Provider:
     """Provider model."""
@@ -195,6 +263,27 @@ class APILog:
         return cls(**data)
 
 
+@dataclass
+class APILogSummary:
+    """API log row without the request/response payloads, for list views."""
+    
+    id: str
+    session_id: str
+    provider_name: str
+    model_name: str
+    request_type: str
+    status_code: Optional[int]
+    tokens_in: int
+    tokens_out: int
+    latency_ms: float
+    ttft_ms: float
+    cost: float
+    created_at: str
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
 class Database:
     """SQLite database manager."""
     
@@ -203,7 +292,13 @@ class Database:
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
+        self._cache_lock = threading.RLock()
+        self._provider_cache: Dict[str, Provider] = {}
+        self._model_cache: Dict[Tuple[str, str], Model] = {}
+        self._agent_cache: Dict[str, Agent] = {}
+        self._tool_cache: Dict[str, Tool] = {}
         self._init_db()
+        self._load_caches()
     
     @contextmanager
     def get_connection(self):
@@ -220,7 +315,7 @@ class Database:
         with self.get_connection() as conn:
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS providers (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT UNIQUE NOT NULL,
                     provider_type TEXT NOT NULL,
                     api_key TEXT,
@@ -232,7 +327,7 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS models (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT NOT NULL,
                     provider_name TEXT NOT NULL,
                     model_id TEXT NOT NULL,
@@ -247,7 +342,7 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS agents (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT UNIQUE NOT NULL,
                     system_prompt TEXT NOT NULL,
                     provider_name TEXT NOT NULL,
@@ -259,9 +354,9 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS sessions (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT NOT NULL,
-                    agent_id TEXT,
+                    agent_id BLOB,
                     provider_name TEXT NOT NULL,
                     model_name TEXT NOT NULL,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
@@ -269,12 +364,12 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS messages (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
+                    id BLOB PRIMARY KEY,
+                    session_id BLOB NOT NULL,
                     role TEXT NOT NULL,
                     content TEXT NOT NULL,
-                    tool_calls TEXT,
-                    tool_results TEXT,
+                    tool_calls BLOB,
+                    tool_results BLOB,
                     tokens_in INTEGER DEFAULT 0,
                     tokens_out INTEGER DEFAULT 0,
                     latency_ms REAL DEFAULT 0.0,
@@ -285,7 +380,7 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS tools (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT UNIQUE NOT NULL,
                     description TEXT NOT NULL,
                     parameters TEXT NOT NULL,
@@ -296,9 +391,9 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS schedules (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT UNIQUE NOT NULL,
-                    agent_id TEXT NOT NULL,
+                    agent_id BLOB NOT NULL,
                     prompt TEXT NOT NULL,
                     schedule_type TEXT NOT NULL,
                     schedule_value TEXT NOT NULL,
@@ -310,13 +405,13 @@ class Database:
                 );
                 
                 CREATE TABLE IF NOT EXISTS api_logs (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
+                    id BLOB PRIMARY KEY,
+                    session_id BLOB NOT NULL,
                     provider_name TEXT NOT NULL,
                     model_name TEXT NOT NULL,
                     request_type TEXT NOT NULL,
-                    request_data TEXT NOT NULL,
-                    response_data TEXT,
+                    request_data BLOB NOT NULL,
+                    response_data BLOB,
                     status_code INTEGER,
                     error TEXT,
                     tokens_in INTEGER DEFAULT 0,
@@ -331,32 +426,78 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id);
                 CREATE INDEX IF NOT EXISTS idx_api_logs_session ON api_logs(session_id);
                 CREATE INDEX IF NOT EXISTS idx_api_logs_created ON api_logs(created_at);
+                CREATE INDEX IF NOT EXISTS idx_api_logs_session_created ON api_logs(session_id, created_at);
             """)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_text_ids(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             conn.commit()
     
+    def _migrate_text_ids(self, conn: sqlite3.Connection):
+        """Rewrite UUIDs stored as TEXT by older versions into BLOBs."""
+        for table, columns in _ID_COLUMNS.items():
+            for column in columns:
+                rows = conn.execute(
+                    f"SELECT rowid, {column} FROM {table} WHERE typeof({column}) = 'text'"
+                ).fetchall()
+                conn.executemany(
+                    f"UPDATE {table} SET {column} = ? WHERE rowid = ?",
+                    [(_pack_id(row[1]), row[0]) for row in rows]
+                )
+    
+    def _load_caches(self):
+        """Preload the small lookup tables into memory."""
+        self._load_provider_cache()
+        self._load_model_cache()
+        self._load_agent_cache()
+        self._load_tool_cache()
+    
+    # Reloads read and install their snapshot under one lock, so a reload that
+    # started before a concurrent write cannot overwrite the newer cache.
+    def _load_provider_cache(self):
+        with self._cache_lock, self.get_connection() as conn:
+            rows = conn.execute("SELECT * FROM providers").fetchall()
+            self._provider_cache = {row["name"]: _from_row(Provider, row) for row in rows}
+    
+    def _load_model_cache(self):
+        with self._cache_lock, self.get_connection() as conn:
+            rows = conn.execute("SELECT * FROM models").fetchall()
+            self._model_cache = {
+                (row["provider_name"], row["model_id"]): _from_row(Model, row) for row in rows
+            }
+    
+    def _load_agent_cache(self):
+        with self._cache_lock, self.get_connection() as conn:
+            rows = conn.execute("SELECT * FROM agents").fetchall()
+            self._agent_cache = {row["name"]: _from_row(Agent, row) for row in rows}
+    
+    def _load_tool_cache(self):
+        with self._cache_lock, self.get_connection() as conn:
+            rows = conn.execute("SELECT * FROM tools").fetchall()
+            self._tool_cache = {row["name"]: _from_row(Tool, row) for row in rows}
+    
     def create_provider(self, provider: Provider) -> Provider:
         with self.get_connection() as conn:
             conn.execute("""
                 INSERT INTO providers (id, name, provider_type, api_key, base_url, enabled, extra)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (provider.id, provider.name, provider.provider_type, 
+            """, (_pack_id(provider.id), provider.name, provider.provider_type, 
                   provider.api_key, provider.base_url, 
                   int(provider.enabled), provider.extra))
             conn.commit()
+        self._load_provider_cache()
         return provider
     
     def get_providers(self, enabled_only: bool = False) -> List[Provider]:
-        with self.get_connection() as conn:
-            query = "SELECT * FROM providers"
-            if enabled_only:
-                query += " WHERE enabled = 1"
-            rows = conn.execute(query).fetchall()
-            return [Provider(**dict(row)) for row in rows]
+        with self._cache_lock:
+            return [replace(p) for p in self._provider_cache.values()
+                    if p.enabled or not enabled_only]
     
     def get_provider(self, name: str) -> Optional[Provider]:
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM providers WHERE name = ?", (name,)).fetchone()
-            return Provider(**dict(row)) if row else None
+        with self._cache_lock:
+            provider = self._provider_cache.get(name)
+            return replace(provider) if provider else None
     
     def update_provider(self, provider: Provider) -> Provider:
         with self.get_connection() as conn:
@@ -364,14 +505,16 @@ class Database:
                 UPDATE providers SET name=?, provider_type=?, api_key=?, base_url=?, 
                 enabled=?, extra=?, updated_at=CURRENT_TIMESTAMP WHERE id=?
             """, (provider.name, provider.provider_type, provider.api_key,
-                  provider.base_url, int(provider.enabled), provider.extra, provider.id))
+                  provider.base_url, int(provider.enabled), provider.extra, _pack_id(provider.id)))
             conn.commit()
+        self._load_provider_cache()
         return provider
     
     def delete_provider(self, name: str):
         with self.get_connection() as conn:
             conn.execute("DELETE FROM providers WHERE name = ?", (name,))
             conn.commit()
+        self._load_provider_cache()
     
     def create_model(self, model: Model) -> Model:
         with self.get_connection() as conn:
@@ -379,27 +522,22 @@ class Database:
                 INSERT INTO models (id, name, provider_name, model_id, context_window, max_tokens,
                 cost_per_input, cost_per_output, is_default)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (model.id, model.name, model.provider_name, model.model_id,
+            """, (_pack_id(model.id), model.name, model.provider_name, model.model_id,
                   model.context_window, model.max_tokens, model.cost_per_input,
                   model.cost_per_output, int(model.is_default)))
             conn.commit()
+        self._load_model_cache()
         return model
     
     def get_models(self, provider_name: Optional[str] = None) -> List[Model]:
-        with self.get_connection() as conn:
-            if provider_name:
-                rows = conn.execute("SELECT * FROM models WHERE provider_name = ?", (provider_name,)).fetchall()
-            else:
-                rows = conn.execute("SELECT * FROM models").fetchall()
-            return [Model(**dict(row)) for row in rows]
+        with self._cache_lock:
+            return [replace(m) for m in self._model_cache.values()
+                    if not provider_name or m.provider_name == provider_name]
     
     def get_model(self, provider_name: str, model_id: str) -> Optional[Model]:
-        with self.get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM models WHERE provider_name = ? AND model_id = ?",
-                (provider_name, model_id)
-            ).fetchone()
-            return Model(**dict(row)) if row else None
+        with self._cache_lock:
+            model = self._model_cache.get((provider_name, model_id))
+            return replace(model) if model else None
     
     def update_model(self, model: Model) -> Model:
         with self.get_connection() as conn:
@@ -409,42 +547,42 @@ class Database:
                 updated_at=CURRENT_TIMESTAMP WHERE id=?
             """, (model.name, model.provider_name, model.model_id,
                   model.context_window, model.max_tokens, model.cost_per_input,
-                  model.cost_per_output, int(model.is_default), model.id))
+                  model.cost_per_output, int(model.is_default), _pack_id(model.id)))
             conn.commit()
+        self._load_model_cache()
         return model
     
     def delete_model(self, id: str):
         with self.get_connection() as conn:
-            conn.execute("DELETE FROM models WHERE id = ?", (id,))
+            conn.execute("DELETE FROM models WHERE id = ?", (_pack_id(id),))
             conn.commit()
+        self._load_model_cache()
     
     def create_agent(self, agent: Agent) -> Agent:
         with self.get_connection() as conn:
             conn.execute("""
                 INSERT INTO agents (id, name, system_prompt, provider_name, model_name, tools, enabled)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (agent.id, agent.name, agent.system_prompt, agent.provider_name,
+            """, (_pack_id(agent.id), agent.name, agent.system_prompt, agent.provider_name,
                   agent.model_name, agent.tools, int(agent.enabled)))
             conn.commit()
+        self._load_agent_cache()
         return agent
     
     def get_agents(self, enabled_only: bool = False) -> List[Agent]:
-        with self.get_connection() as conn:
-            query = "SELECT * FROM agents"
-            if enabled_only:
-                query += " WHERE enabled = 1"
-            rows = conn.execute(query).fetchall()
-            return [Agent(**dict(row)) for row in rows]
+        with self._cache_lock:
+            return [replace(a) for a in self._agent_cache.values()
+                    if a.enabled or not enabled_only]
     
     def get_agent(self, name: str) -> Optional[Agent]:
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM agents WHERE name = ?", (name,)).fetchone()
-            return Agent(**dict(row)) if row else None
+        with self._cache_lock:
+            agent = self._agent_cache.get(name)
+            return replace(agent) if agent else None
     
     def get_agent_by_id(self, id: str) -> Optional[Agent]:
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM agents WHERE id = ?", (id,)).fetchone()
-            return Agent(**dict(row)) if row else None
+        with self._cache_lock:
+            agent = next((a for a in self._agent_cache.values() if a.id == id), None)
+            return replace(agent) if agent else None
     
     def update_agent(self, agent: Agent) -> Agent:
         with self.get_connection() as conn:
@@ -452,21 +590,23 @@ class Database:
                 UPDATE agents SET name=?, system_prompt=?, provider_name=?, model_name=?,
                 tools=?, enabled=?, updated_at=CURRENT_TIMESTAMP WHERE id=?
             """, (agent.name, agent.system_prompt, agent.provider_name,
-                  agent.model_name, agent.tools, int(agent.enabled), agent.id))
+                  agent.model_name, agent.tools, int(agent.enabled), _pack_id(agent.id)))
             conn.commit()
+        self._load_agent_cache()
         return agent
     
     def delete_agent(self, name: str):
         with self.get_connection() as conn:
             conn.execute("DELETE FROM agents WHERE name = ?", (name,))
             conn.commit()
+        self._load_agent_cache()
     
     def create_session(self, session: Session) -> Session:
         with self.get_connection() as conn:
             conn.execute("""
                 INSERT INTO sessions (id, name, agent_id, provider_name, model_name)
                 VALUES (?, ?, ?, ?, ?)
-            """, (session.id, session.name, session.agent_id,
+            """, (_pack_id(session.id), session.name, _pack_id(session.agent_id),
                   session.provider_name, session.model_name))
             conn.commit()
         return session
@@ -474,28 +614,29 @@ class Database:
     def get_sessions(self) -> List[Session]:
         with self.get_connection() as conn:
             rows = conn.execute("SELECT * FROM sessions ORDER BY updated_at DESC").fetchall()
-            return [Session(**dict(row)) for row in rows]
+            return [_from_row(Session, row) for row in rows]
     
     def get_session(self, id: str) -> Optional[Session]:
         with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM sessions WHERE id = ?", (id,)).fetchone()
-            return Session(**dict(row)) if row else None
+            row = conn.execute("SELECT * FROM sessions WHERE id = ?", (_pack_id(id),)).fetchone()
+            return _from_row(Session, row) if row else None
     
     def update_session(self, session: Session) -> Session:
         with self.get_connection() as conn:
             conn.execute("""
                 UPDATE sessions SET name=?, agent_id=?, provider_name=?, model_name=?,
                 updated_at=CURRENT_TIMESTAMP WHERE id=?
-            """, (session.name, session.agent_id, session.provider_name,
-                  session.model_name, session.id))
+            """, (session.name, _pack_id(session.agent_id), session.provider_name,
+                  session.model_name, _pack_id(session.id)))
             conn.commit()
         return session
     
     def delete_session(self, id: str):
         with self.get_connection() as conn:
-            conn.execute("DELETE FROM messages WHERE session_id = ?", (id,))
-            conn.execute("DELETE FROM api_logs WHERE session_id = ?", (id,))
-            conn.execute("DELETE FROM sessions WHERE id = ?", (id,))
+            key = _pack_id(id)
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (key,))
+            conn.execute("DELETE FROM api_logs WHERE session_id = ?", (key,))
+            conn.execute("DELETE FROM sessions WHERE id = ?", (key,))
             conn.commit()
     
     def create_message(self, message: Message) -> Message:
@@ -504,19 +645,24 @@ class Database:
                 INSERT INTO messages (id, session_id, role, content, tool_calls, tool_results,
                 tokens_in, tokens_out, latency_ms, ttft_ms, cost)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (message.id, message.session_id, message.role, message.content,
-                  message.tool_calls, message.tool_results, message.tokens_in,
+            """, (_pack_id(message.id), _pack_id(message.session_id), message.role, message.content,
+                  _pack_payload(message.tool_calls), _pack_payload(message.tool_results), message.tokens_in,
                   message.tokens_out, message.latency_ms, message.ttft_ms, message.cost))
             conn.commit()
         return message
     
+    def clear_messages(self, session_id: str):
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (_pack_id(session_id),))
+            conn.commit()
+    
     def get_messages(self, session_id: str) -> List[Message]:
         with self.get_connection() as conn:
             rows = conn.execute(
                 "SELECT * FROM messages WHERE session_id = ? ORDER BY created_at",
-                (session_id,)
+                (_pack_id(session_id),)
             ).fetchall()
-            return [Message(**dict(row)) for row in rows]
+            return [_from_row(Message, row) for row in rows]
     
     def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         with self.get_connection() as conn:
@@ -530,7 +676,7 @@ class Database:
                     SUM(tokens_out) * 1000.0 / SUM(latency_ms) as tokens_per_second
                 FROM messages 
                 WHERE session_id = ?
-            """, (session_id,)).fetchone()
+            """, (_pack_id(session_id),)).fetchone()
             return dict(stats) if stats else {}
     
     def create_tool(self, tool: Tool) -> Tool:
@@ -538,23 +684,21 @@ class Database:
             conn.execute("""
                 INSERT INTO tools (id, name, description, parameters, function, enabled)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (tool.id, tool.name, tool.description, tool.parameters,
+            """, (_pack_id(tool.id), tool.name, tool.description, tool.parameters,
                   tool.function, int(tool.enabled)))
             conn.commit()
+        self._load_tool_cache()
         return tool
     
     def get_tools(self, enabled_only: bool = False) -> List[Tool]:
-        with self.get_connection() as conn:
-            query = "SELECT * FROM tools"
-            if enabled_only:
-                query += " WHERE enabled = 1"
-            rows = conn.execute(query).fetchall()
-            return [Tool(**dict(row)) for row in rows]
+        with self._cache_lock:
+            return [replace(t) for t in self._tool_cache.values()
+                    if t.enabled or not enabled_only]
     
     def get_tool(self, name: str) -> Optional[Tool]:
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM tools WHERE name = ?", (name,)).fetchone()
-            return Tool(**dict(row)) if row else None
+        with self._cache_lock:
+            tool = self._tool_cache.get(name)
+            return replace(tool) if tool else None
     
     def update_tool(self, tool: Tool) -> Tool:
         with self.get_connection() as conn:
@@ -562,21 +706,23 @@ class Database:
                 UPDATE tools SET name=?, description=?, parameters=?, function=?,
                 enabled=?, updated_at=CURRENT_TIMESTAMP WHERE id=?
             """, (tool.name, tool.description, tool.parameters,
-                  tool.function, int(tool.enabled), tool.id))
+                  tool.function, int(tool.enabled), _pack_id(tool.id)))
             conn.commit()
+        self._load_tool_cache()
         return tool
     
     def delete_tool(self, name: str):
         with self.get_connection() as conn:
             conn.execute("DELETE FROM tools WHERE name = ?", (name,))
             conn.commit()
+        self._load_tool_cache()
     
     def create_schedule(self, schedule: Schedule) -> Schedule:
         with self.get_connection() as conn:
             conn.execute("""
                 INSERT INTO schedules (id, name, agent_id, prompt, schedule_type, schedule_value, enabled, last_run)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (schedule.id, schedule.name, schedule.agent_id, schedule.prompt,
+            """, (_pack_id(schedule.id), schedule.name, _pack_id(schedule.agent_id), schedule.prompt,
                   schedule.schedule_type, schedule.schedule_value, int(schedule.enabled), schedule.last_run))
             conn.commit()
         return schedule
@@ -587,21 +733,21 @@ class Database:
             if enabled_only:
                 query += " WHERE enabled = 1"
             rows = conn.execute(query).fetchall()
-            return [Schedule(**dict(row)) for row in rows]
+            return [_from_row(Schedule, row) for row in rows]
     
     def get_schedule(self, name: str) -> Optional[Schedule]:
         with self.get_connection() as conn:
             row = conn.execute("SELECT * FROM schedules WHERE name = ?", (name,)).fetchone()
-            return Schedule(**dict(row)) if row else None
+            return _from_row(Schedule, row) if row else None
     
     def update_schedule(self, schedule: Schedule) -> Schedule:
         with self.get_connection() as conn:
             conn.execute("""
                 UPDATE schedules SET name=?, agent_id=?, prompt=?, schedule_type=?,
                 schedule_value=?, enabled=?, last_run=?, updated_at=CURRENT_TIMESTAMP WHERE id=?
-            """, (schedule.name, schedule.agent_id, schedule.prompt,
+            """, (schedule.name, _pack_id(schedule.agent_id), schedule.prompt,
                   schedule.schedule_type, schedule.schedule_value, int(schedule.enabled),
-                  schedule.last_run, schedule.id))
+                  schedule.last_run, _pack_id(schedule.id)))
             conn.commit()
         return schedule
     
@@ -617,8 +763,8 @@ class Database:
                 request_data, response_data, status_code, error, tokens_in, tokens_out,
                 latency_ms, ttft_ms, cost)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (log.id, log.session_id, log.provider_name, log.model_name,
-                  log.request_type, log.request_data, log.response_data,
+            """, (_pack_id(log.id), _pack_id(log.session_id), log.provider_name, log.model_name,
+                  log.request_type, _pack_payload(log.request_data), _pack_payload(log.response_data),
                   log.status_code, log.error, log.tokens_in, log.tokens_out,
                   log.latency_ms, log.ttft_ms, log.cost))
             conn.commit()
@@ -628,9 +774,9 @@ class Database:
         with self.get_connection() as conn:
             rows = conn.execute(
                 "SELECT * FROM api_logs WHERE session_id = ? ORDER BY created_at DESC LIMIT ?",
-                (session_id, limit)
+                (_pack_id(session_id), limit)
             ).fetchall()
-            return [APILog(**dict(row)) for row in rows]
+            return [_from_row(APILog, row) for row in rows]
     
     def get_recent_api_logs(self, limit: int = 50) -> List[APILog]:
         with self.get_connection() as conn:
@@ -638,7 +784,23 @@ class Database:
                 "SELECT * FROM api_logs ORDER BY created_at DESC LIMIT ?",
                 (limit,)
             ).fetchall()
-            return [APILog(**dict(row)) for row in rows]
+            return [_from_row(APILog, row) for row in rows]
+    
+    def get_api_logs_summary(self, session_id: Optional[str] = None, limit: int = 50) -> List[APILogSummary]:
+        """Recent API logs without payload columns, optionally for one session."""
+        query = """
+            SELECT id, session_id, provider_name, model_name, request_type, status_code,
+            tokens_in, tokens_out, latency_ms, ttft_ms, cost, created_at FROM api_logs
+        """
+        with self.get_connection() as conn:
+            if session_id:
+                rows = conn.execute(
+                    query + " WHERE session_id = ? ORDER BY created_at DESC LIMIT ?",
+                    (_pack_id(session_id), limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            return [_from_row(APILogSummary, row) for row in rows]
     
     def get_provider_stats(self, provider_name: str, days: int = 7) -> Dict[str, Any]:
         with self.get_connection() as conn:
@@ -1,23 +1,16 @@
-"""Terminal UI components using standard curses and rich."""
+"""Terminal UI components using standard curses."""
 
 import curses
 import sys
 import os
-from typing import Dict, List, Optional, Any, Callable
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass
-from datetime import datetime
 from io import StringIO
 
-try:
-    from rich.text import Text
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich.box import Box, ROUNDED
-    HAS_RICH = True
-except ImportError:
-    HAS_RICH = False
-
 
 @dataclass
 class UITheme:
@@ -40,6 +33,18 @@ class UITheme:
     panel_bg: int = 0
 
 
+# Raw terminal mode switches, each written in a single call. The alternate
+# screen is entered first and left last.
+TERMINAL_ENTER_SEQ = "\033[?1049h\033[?1h\033[?25l"
+TERMINAL_EXIT_SEQ = "\033[?1l\033[?25h\033[?1049l"
+
+# Minimum seconds between content rebuilds for panels that buffer updates.
+FLUSH_INTERVAL = 0.05
+
+# How long input loops wait for a key before giving the UI a frame (~30 fps).
+FRAME_INTERVAL_MS = 33
+
+
 class Colors:
     """Color pairs for curses."""
     
@@ -53,17 +58,39 @@ class Colors:
     WHITE = 7
     DEFAULT = 8
     
+    # Colors the UI draws with, in pair-number order.
+    USED = (BLACK, RED, GREEN, YELLOW, BLUE, MAGENTA, CYAN, WHITE)
+    
+    # Attribute values for each pair, filled once by init_pairs so draw
+    # calls index a list instead of calling curses.color_pair().
+    _pair_cache: List[int] = []
+    _pair_bold: List[int] = []
+    
     @classmethod
     def init_pairs(cls, stdscr):
         """Initialize color pairs."""
         curses.start_color()
         curses.use_default_colors()
-        for i in range(256):
-            curses.init_pair(i, i, -1)
+        # Pair N is color N on the default background; pair 0 is fixed by
+        # curses, and colors the terminal lacks are left uninitialized.
+        for color in cls.USED[1:]:
+            if color < curses.COLORS and color < curses.COLOR_PAIRS:
+                curses.init_pair(color, color, -1)
+        cls._pair_cache = [curses.color_pair(color) for color in cls.USED]
+        # DEFAULT (the entry after the USED colors) is the terminal's own
+        # colors, which pair 0 holds.
+        cls._pair_cache.append(curses.color_pair(0))
+        cls._pair_bold = [p | curses.A_BOLD for p in cls._pair_cache]
     
     @classmethod
     def pair(cls, fg: int, bg: int = 0) -> int:
-        return curses.color_pair(fg) | curses.A_BOLD if fg < 8 else fg
+        """Get the attribute for a color's pair."""
+        return cls._pair_cache[fg]
+    
+    @classmethod
+    def bold(cls, fg: int) -> int:
+        """Get the attribute for a color's pair in bold."""
+        return cls._pair_bold[fg]
 
 
 class Panel:
@@ -79,61 +106,145 @@ class Panel:
         self.content = []
         self.scroll_offset = 0
         self.ui = None
+        self._border_key = None
+        self._border_rows = ("", "", "")
+        self._dirty = True
+        self._rendered_key = None
+        self._wrapped_cache: Optional[List[str]] = None
+        self._wrapped_key: Tuple = ()
+        self._blank = ""
+        self.win, self.win_y, self.win_x = self.create_window(stdscr, y, x, height, width)
+    
+    @staticmethod
+    def create_window(stdscr, y: int, x: int, height: int, width: int) -> Tuple[Any, int, int]:
+        """Create the panel's own window and the offset to draw at within it.
+        
+        Panels draw into a derived window so each can be flushed with
+        noutrefresh() on its own; it shares cells with stdscr, so screen
+        capture still sees everything. A panel that does not fit on screen
+        falls back to drawing on stdscr directly.
+        """
+        try:
+            win = stdscr.derwin(height, width, y, x)
+        except curses.error:
+            return stdscr, y, x
+        win.keypad(True)
+        return win, 0, 0
     
     def clear(self):
         """Clear the panel."""
+        if self.win is not self.stdscr:
+            self.win.erase()
+            return
+        if len(self._blank) != self.width:
+            self._blank = " " * self.width
+        blank = self._blank
         for y in range(self.height):
             try:
-                self.stdscr.addstr(self.y + y, self.x, " " * self.width)
+                self.win.addstr(self.win_y + y, self.win_x, blank)
             except curses.error:
                 pass
     
-    def draw_border(self):
-        """Draw panel border."""
-        try:
+    def get_border_rows(self) -> Tuple[str, str, str]:
+        """Get the (top, middle, bottom) border rows, rebuilt only on resize or retitle."""
+        key = (self.width, self.title)
+        if self._border_key != key:
+            inner = self.width - 2
             if self.title:
                 title_str = f" {self.title} "
-                self.stdscr.addstr(self.y, self.x, "┌", curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y, self.x + 1, title_str, curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y, self.x + len(title_str) + 1, "─" * (self.width - len(title_str) - 2), curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y, self.x + self.width - 1, "┐", curses.color_pair(Colors.CYAN))
-                
-                for y in range(self.y + 1, self.y + self.height - 1):
-                    self.stdscr.addstr(y, self.x, "│", curses.color_pair(Colors.CYAN))
-                    self.stdscr.addstr(y, self.x + self.width - 1, "│", curses.color_pair(Colors.CYAN))
-                
-                self.stdscr.addstr(self.y + self.height - 1, self.x, "└", curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y + self.height - 1, self.x + self.width - 1, "┘", curses.color_pair(Colors.CYAN))
-                for x in range(self.x + 1, self.x + self.width - 1):
-                    self.stdscr.addstr(self.y + self.height - 1, x, "─", curses.color_pair(Colors.CYAN))
+                top = "┌" + title_str + "─" * (inner - len(title_str)) + "┐"
             else:
-                for y in range(self.y, self.y + self.height):
-                    self.stdscr.addstr(y, self.x, "│", curses.color_pair(Colors.CYAN))
-                    self.stdscr.addstr(y, self.x + self.width - 1, "│", curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y, self.x, "┌" + "─" * (self.width - 2) + "┐", curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y + self.height - 1, self.x, "└" + "─" * (self.width - 2) + "┘", curses.color_pair(Colors.CYAN))
+                top = "┌" + "─" * inner + "┐"
+            self._border_rows = (top, "│" + " " * inner + "│", "└" + "─" * inner + "┘")
+            self._border_key = key
+        return self._border_rows
+    
+    def draw_border(self):
+        """Draw panel border, blanking the interior."""
+        top, middle, bottom = self.get_border_rows()
+        addstr = self.win.addstr
+        x = self.win_x
+        color = Colors._pair_cache[Colors.CYAN]
+        try:
+            addstr(self.win_y, x, top, color)
+            for y in range(self.win_y + 1, self.win_y + self.height - 1):
+                addstr(y, x, middle, color)
+            addstr(self.win_y + self.height - 1, x, bottom, color)
         except curses.error:
             pass
     
     def add_text(self, y: int, x: int, text: str, color: int = Colors.WHITE):
         """Add text to panel."""
         try:
-            self.stdscr.addstr(self.y + y, self.x + x, text[:self.width - x - 1], color)
+            self.win.addstr(self.win_y + y, self.win_x + x, text[:self.width - x - 1], color)
         except curses.error:
             pass
     
-    def render(self):
-        """Render the panel."""
-        self.clear()
+    def invalidate(self):
+        """Force a full redraw on the next render."""
+        self._dirty = True
+        self._rendered_key = None
+        self._wrapped_cache = None
+    
+    def flush(self, force: bool = False):
+        """Apply buffered updates to content. Panels without buffering have nothing to do."""
+        pass
+    
+    def render(self) -> bool:
+        """Render the panel if it changed. Returns True if anything was drawn."""
+        if not self._dirty:
+            return False
+        self._dirty = False
+        
+        visible = self.get_display_lines()[self.scroll_offset:self.scroll_offset + self.height - 2]
+        key = (tuple(visible), self.scroll_offset, self.width, self.height)
+        if key == self._rendered_key:
+            return False
+        self._rendered_key = key
+        
         self.draw_border()
-        for i, line in enumerate(self.content[self.scroll_offset:self.scroll_offset + self.height - 2]):
-            self.add_text(i + 1, 1, line[:self.width - 2])
+        for i, line in enumerate(visible):
+            self.add_text(i + 1, 1, line)
+        return True
+    
+    def get_display_lines(self) -> List[str]:
+        """Get content lines truncated to the panel width, cached until content or width changes."""
+        key = (id(self.content), self.width)
+        if self._wrapped_cache is None or self._wrapped_key != key:
+            limit = self.width - 2
+            self._wrapped_cache = [line[:limit] for line in self.content]
+            self._wrapped_key = key
+        return self._wrapped_cache
     
     def set_content(self, lines: List[str]):
         """Set panel content."""
         self.content = lines
         if len(self.content) > self.height - 2:
             self.scroll_offset = max(0, len(self.content) - (self.height - 2))
+        self._wrapped_cache = None
+        self._dirty = True
+
+
+_ts_cache = {'sec': 0, 'str': ''}
+
+
+def _now_hms() -> str:
+    """Current local time as HH:MM:SS, formatted at most once per second."""
+    s = int(time.time())
+    if s != _ts_cache['sec']:
+        _ts_cache['sec'] = s
+        _ts_cache['str'] = time.strftime("%H:%M:%S", time.localtime(s))
+    return _ts_cache['str']
+
+
+# Most transcript lines the chat panel keeps; older lines are dropped.
+MAX_CHAT_LINES = 10_000
+
+# Chat role -> (color, label); other roles use magenta and their title-cased name.
+ROLE_STYLES = {
+    "user": (Colors.GREEN, "You"),
+    "assistant": (Colors.YELLOW, "AI"),
+}
 
 
 class ChatPanel(Panel):
@@ -141,41 +252,57 @@ class ChatPanel(Panel):
     
     def __init__(self, stdscr, y: int, x: int, height: int, width: int):
         super().__init__(stdscr, y, x, height, width, " Chat ")
-        self.messages = []
+        self.messages = deque(maxlen=MAX_CHAT_LINES)
+        self._flat_lines = deque(maxlen=MAX_CHAT_LINES)
+        self._pending_updates = []
+        self._last_flush = 0.0
     
     def add_message(self, role: str, content: str, metadata: Optional[Dict] = None):
         """Add a message to the chat."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if role == "user":
-            role_color = curses.color_pair(Colors.GREEN)
-            role_label = "You"
-        elif role == "assistant":
-            role_color = curses.color_pair(Colors.YELLOW)
-            role_label = "AI"
-        else:
-            role_color = curses.color_pair(Colors.MAGENTA)
+        timestamp = _now_hms()
+        
+        color, role_label = ROLE_STYLES.get(role, (Colors.MAGENTA, None))
+        role_color = Colors._pair_cache[color]
+        if role_label is None:
             role_label = role.title()
         
         lines = content.split("\n")
         
         header = f"[{timestamp}] {role_label}:"
-        self.messages.append((header, role_color, True))
+        self._pending_updates.append((header, role_color, True))
         
         for line in lines:
-            self.messages.append((f"  {line}", role_color, False))
+            self._pending_updates.append((f"  {line}", role_color, False))
         
         if metadata:
             meta_lines = self.format_metadata(metadata)
             for line in meta_lines:
-                self.messages.append((f"    {line}", curses.color_pair(Colors.CYAN), False))
-        
-        self.messages.append(("", Colors.WHITE, False))
+                self._pending_updates.append((f"    {line}", Colors._pair_cache[Colors.CYAN], False))
         
+        self._pending_updates.append(("", Colors.WHITE, False))
+        self._dirty = True
+    
+    def flush(self, force: bool = False):
+        """Move buffered messages into the panel, at most once per FLUSH_INTERVAL."""
+        if not self._pending_updates:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self.messages.extend(self._pending_updates)
+        self._flat_lines.extend(line for line, _, _ in self._pending_updates)
+        self._pending_updates = []
+        self._last_flush = now
         self.update_content()
     
     def format_metadata(self, metadata: Dict) -> List[str]:
         """Format metadata for display."""
+        return list(self._format_metadata_cached(tuple(sorted(metadata.items()))))
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _format_metadata_cached(items: Tuple[Tuple[str, Any], ...]) -> Tuple[str, ...]:
+        metadata = dict(items)
         lines = []
         if "tokens_in" in metadata and "tokens_out" in metadata:
             lines.append(f"Tokens: {metadata['tokens_in']} in, {metadata['tokens_out']} out")
@@ -187,23 +314,28 @@ class ChatPanel(Panel):
             lines.append(f"Cost: ${metadata['cost']:.4f}")
         if "tokens_per_second" in metadata:
             lines.append(f"Speed: {metadata['tokens_per_second']:.1f} tok/s")
-        return lines
+        return tuple(lines)
     
     def update_content(self):
-        """Update panel content from messages."""
-        self.content = []
-        for msg, color, is_header in self.messages:
-            if is_header:
-                self.content.append(msg)
-            else:
-                self.content.append(msg)
+        """Update panel content with only the visible tail of the transcript."""
+        visible = max(0, self.height - 2)
+        self.content = list(islice(reversed(self._flat_lines), visible))
+        self.content.reverse()
+        self.scroll_offset = 0
         self.set_content(self.content)
     
     def clear_chat(self):
         """Clear all messages."""
-        self.messages = []
+        self.messages.clear()
+        self._flat_lines.clear()
         self.content = []
         self.scroll_offset = 0
+        self._wrapped_cache = None
+        self._pending_updates = []
+        # A cleared panel shows its next messages right away instead of
+        # sitting empty until the throttle window passes.
+        self._last_flush = 0.0
+        self._dirty = True
 
 
 class TransparencyPanel(Panel):
@@ -211,20 +343,24 @@ class TransparencyPanel(Panel):
     
     def __init__(self, stdscr, y: int, x: int, height: int, width: int):
         super().__init__(stdscr, y, x, height, width, " Transparency ")
-        self.api_logs = []
+        self.api_logs = deque(maxlen=50)
         self.stats = {}
+        self._pending_updates = []
+        self._last_flush = 0.0
+        self._stats_block: List[str] = ["  No data yet"]
+        self._log_block = deque(maxlen=20)
     
     def add_api_log(self, log: Dict):
         """Add API log entry."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _now_hms()
         
         status = log.get("status_code", "N/A")
         if status and status < 300:
-            status_color = curses.color_pair(Colors.GREEN)
+            status_color = Colors._pair_cache[Colors.GREEN]
         elif status and status < 500:
-            status_color = curses.color_pair(Colors.YELLOW)
+            status_color = Colors._pair_cache[Colors.YELLOW]
         else:
-            status_color = curses.color_pair(Colors.RED)
+            status_color = Colors._pair_cache[Colors.RED]
         
         latency = log.get("latency_ms", 0)
         tokens_in = log.get("tokens_in", 0)
@@ -232,39 +368,43 @@ class TransparencyPanel(Panel):
         
         entry = f"[{timestamp}] {log.get('provider_name', '?')}/{log.get('model_name', '?')} - {status} - {latency:.0f}ms - {tokens_in}/{tokens_out}t"
         
-        self.api_logs.insert(0, (entry, status_color))
-        
-        if len(self.api_logs) > 50:
-            self.api_logs = self.api_logs[:50]
+        self._pending_updates.append((entry, status_color))
+        self._dirty = True
+    
+    def flush(self, force: bool = False):
+        """Move buffered log entries into the panel, at most once per FLUSH_INTERVAL."""
+        if not self._pending_updates:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        for entry in self._pending_updates:
+            self.api_logs.appendleft(entry)
+            self._log_block.appendleft(entry[0])
+        self._pending_updates = []
+        self._last_flush = now
         
         self.update_content()
     
     def update_stats(self, stats: Dict):
-        """Update statistics."""
-        self.stats = stats
+        """Update statistics, reformatting only when they changed."""
+        if stats == self.stats:
+            return
+        self.stats = dict(stats)
+        if stats:
+            self._stats_block = [
+                f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}"
+                for key, value in stats.items()
+            ]
+        else:
+            self._stats_block = ["  No data yet"]
         self.update_content()
     
     def update_content(self):
-        """Update panel content."""
-        self.content = []
-        
-        self.content.append("=== Statistics ===")
-        if self.stats:
-            for key, value in self.stats.items():
-                if isinstance(value, float):
-                    self.content.append(f"  {key}: {value:.2f}")
-                else:
-                    self.content.append(f"  {key}: {value}")
-        else:
-            self.content.append("  No data yet")
-        
-        self.content.append("")
-        self.content.append("=== Recent API Calls ===")
-        
-        for log, color in self.api_logs[:20]:
-            self.content.append(log)
-        
-        self.set_content(self.content)
+        """Update panel content from the pre-formatted stats and log blocks."""
+        self.set_content(
+            ["=== Statistics ==="] + self._stats_block + ["", "=== Recent API Calls ==="] + list(self._log_block)
+        )
 
 
 class InputPanel(Panel):
@@ -279,7 +419,7 @@ class InputPanel(Panel):
     
     def get_input(self, prompt: str = "> ") -> str:
         """Get user input."""
-        self.stdscr.nodelay(True)
+        self.win.nodelay(True)
         self.clear()
         self.draw_border()
         
@@ -288,93 +428,137 @@ class InputPanel(Panel):
         self.history_index = -1
         
         try:
-            self.stdscr.addstr(self.y + 1, self.x + 1, prompt, curses.color_pair(Colors.CYAN))
-            self.stdscr.addstr(self.y + 1, self.x + 1 + len(prompt), self.input_text)
-            self.stdscr.move(self.y + 1, self.x + 1 + len(prompt) + self.cursor_pos)
-            self.stdscr.refresh()
+            self.win.addstr(self.win_y + 1, self.win_x + 1, prompt, Colors._pair_cache[Colors.CYAN])
+            self.win.addstr(self.win_y + 1, self.win_x + 1 + len(prompt), self.input_text)
+            self.win.move(self.win_y + 1, self.win_x + 1 + len(prompt) + self.cursor_pos)
+            self.win.refresh()
+            
+            next_key = self.next_key
+            get_handler = self.KEY_HANDLERS.get
+            ERR = curses.ERR
             
             while True:
-                key = self.stdscr.getch()
-                
-                if key == curses.ERR:
-                    if hasattr(self, 'ui') and self.ui and self.ui.key_queue:
-                        key = self.ui.key_queue.pop(0)
-                    else:
-                        self.stdscr.refresh()
-                        continue
+                key = next_key(wait=True)
                 
-                if key == curses.KEY_ENTER or key in (10, 13):
-                    text = self.input_text
-                    if text.strip():
-                        self.history.append(text)
-                        self.clear()
-                        self.stdscr.nodelay(False)
-                        return text
+                if key == ERR:
                     continue
                 
-                elif key in (curses.KEY_BACKSPACE, 127, 8):
-                    if self.cursor_pos > 0:
-                        self.input_text = self.input_text[:self.cursor_pos - 1] + self.input_text[self.cursor_pos:]
-                        self.cursor_pos -= 1
-                
-                elif key == curses.KEY_DC:
-                    if self.cursor_pos < len(self.input_text):
-                        self.input_text = self.input_text[:self.cursor_pos] + self.input_text[self.cursor_pos + 1:]
-                
-                elif key == curses.KEY_LEFT:
-                    if self.cursor_pos > 0:
-                        self.cursor_pos -= 1
-                
-                elif key == curses.KEY_RIGHT:
-                    if self.cursor_pos < len(self.input_text):
+                # Apply every key that is already waiting (e.g. a paste)
+                # before redrawing, so N queued keys cost one redraw.
+                while key != ERR:
+                    handler = get_handler(key)
+                    if handler is not None:
+                        result = getattr(self, handler)()
+                        if result is not None:
+                            return result
+                    elif 32 <= key <= 126:
+                        char = chr(key)
+                        self.input_text = self.input_text[:self.cursor_pos] + char + self.input_text[self.cursor_pos:]
                         self.cursor_pos += 1
+                    key = next_key()
                 
-                elif key == curses.KEY_UP:
-                    if self.history and self.history_index < len(self.history) - 1:
-                        self.history_index += 1
-                        self.input_text = self.history[-(self.history_index + 1)]
-                        self.cursor_pos = len(self.input_text)
-                
-                elif key == curses.KEY_DOWN:
-                    if self.history_index > 0:
-                        self.history_index -= 1
-                        self.input_text = self.history[-(self.history_index + 1)]
-                        self.cursor_pos = len(self.input_text)
-                    elif self.history_index == 0:
-                        self.history_index = -1
-                        self.input_text = ""
-                        self.cursor_pos = 0
-                
-                elif 32 <= key <= 126:
-                    char = chr(key)
-                    self.input_text = self.input_text[:self.cursor_pos] + char + self.input_text[self.cursor_pos:]
-                    self.cursor_pos += 1
-                
-                elif key == 27:
-                    self.clear()
-                    self.stdscr.nodelay(False)
-                    return ""
-                
-                self.clear()
-                self.draw_border()
-                display_text = self.input_text[:self.width - len(prompt) - 3]
-                display_pos = min(self.cursor_pos, len(display_text))
-                
-                self.stdscr.addstr(self.y + 1, self.x + 1, prompt, curses.color_pair(Colors.CYAN))
-                self.stdscr.addstr(self.y + 1, self.x + 1 + len(prompt), display_text)
-                
-                if self.cursor_pos < len(self.input_text):
-                    self.stdscr.move(self.y + 1, self.x + 1 + len(prompt) + display_pos)
-                else:
-                    self.stdscr.move(self.y + 1, self.x + 1 + len(prompt) + len(display_text))
-                
-                self.stdscr.refresh()
+                self.draw_input_line(prompt)
                 
         except Exception:
-            self.stdscr.nodelay(False)
+            self.win.nodelay(False)
             return ""
         finally:
-            self.stdscr.nodelay(False)
+            self.win.nodelay(False)
+            self.invalidate()
+    
+    def next_key(self, wait: bool = False) -> int:
+        """Get the next key from the terminal or the injected key queue, or ERR.
+        
+        With wait=True, block for up to one frame for terminal input.
+        """
+        if self.ui:
+            return self.ui.read_key(self.win, FRAME_INTERVAL_MS if wait else 0)
+        return self.win.getch()
+    
+    def draw_input_line(self, prompt: str):
+        """Redraw the prompt and the visible part of the input text."""
+        self.clear()
+        self.draw_border()
+        display_text = self.input_text[:self.width - len(prompt) - 3]
+        display_pos = min(self.cursor_pos, len(display_text))
+        
+        self.win.addstr(self.win_y + 1, self.win_x + 1, prompt, Colors._pair_cache[Colors.CYAN])
+        self.win.addstr(self.win_y + 1, self.win_x + 1 + len(prompt), display_text)
+        
+        if self.cursor_pos < len(self.input_text):
+            self.win.move(self.win_y + 1, self.win_x + 1 + len(prompt) + display_pos)
+        else:
+            self.win.move(self.win_y + 1, self.win_x + 1 + len(prompt) + len(display_text))
+        
+        self.win.refresh()
+    
+    # Key handlers return the final input to end get_input, or None to keep reading.
+    
+    def _on_enter(self) -> Optional[str]:
+        text = self.input_text
+        if text.strip():
+            self.history.append(text)
+            self.clear()
+            return text
+        return None
+    
+    def _on_escape(self) -> Optional[str]:
+        self.clear()
+        return ""
+    
+    def _on_backspace(self) -> Optional[str]:
+        if self.cursor_pos > 0:
+            self.input_text = self.input_text[:self.cursor_pos - 1] + self.input_text[self.cursor_pos:]
+            self.cursor_pos -= 1
+        return None
+    
+    def _on_delete(self) -> Optional[str]:
+        if self.cursor_pos < len(self.input_text):
+            self.input_text = self.input_text[:self.cursor_pos] + self.input_text[self.cursor_pos + 1:]
+        return None
+    
+    def _on_left(self) -> Optional[str]:
+        if self.cursor_pos > 0:
+            self.cursor_pos -= 1
+        return None
+    
+    def _on_right(self) -> Optional[str]:
+        if self.cursor_pos < len(self.input_text):
+            self.cursor_pos += 1
+        return None
+    
+    def _on_up(self) -> Optional[str]:
+        if self.history and self.history_index < len(self.history) - 1:
+            self.history_index += 1
+            self.input_text = self.history[-(self.history_index + 1)]
+            self.cursor_pos = len(self.input_text)
+        return None
+    
+    def _on_down(self) -> Optional[str]:
+        if self.history_index > 0:
+            self.history_index -= 1
+            self.input_text = self.history[-(self.history_index + 1)]
+            self.cursor_pos = len(self.input_text)
+        elif self.history_index == 0:
+            self.history_index = -1
+            self.input_text = ""
+            self.cursor_pos = 0
+        return None
+    
+    KEY_HANDLERS: Dict[int, str] = {
+        curses.KEY_ENTER: "_on_enter",
+        10: "_on_enter",
+        13: "_on_enter",
+        curses.KEY_BACKSPACE: "_on_backspace",
+        127: "_on_backspace",
+        8: "_on_backspace",
+        curses.KEY_DC: "_on_delete",
+        curses.KEY_LEFT: "_on_left",
+        curses.KEY_RIGHT: "_on_right",
+        curses.KEY_UP: "_on_up",
+        curses.KEY_DOWN: "_on_down",
+        27: "_on_escape",
+    }
     
     def clear_input(self):
         """Clear input field."""
@@ -432,21 +616,32 @@ class StatusBar:
         self.stdscr = stdscr
         self.height = height
         self.width = width
+        self.pending_refresh = False
+        self._rendered_key = None
+    
+    def invalidate(self):
+        """Force a redraw on the next render."""
+        self._rendered_key = None
     
     def render(self, left: str = "", center: str = "", right: str = ""):
-        """Render status bar."""
+        """Render status bar, skipping unchanged text."""
+        key = (left, center, right)
+        if key == self._rendered_key:
+            return
+        self._rendered_key = key
+        self.pending_refresh = True
         try:
             self.stdscr.addstr(self.height - 1, 0, " " * self.width)
             
             if left:
-                self.stdscr.addstr(self.height - 1, 1, left[:20], curses.color_pair(Colors.CYAN))
+                self.stdscr.addstr(self.height - 1, 1, left[:20], Colors._pair_cache[Colors.CYAN])
             
             if center:
                 center_start = (self.width - len(center)) // 2
-                self.stdscr.addstr(self.height - 1, center_start, center, curses.color_pair(Colors.YELLOW))
+                self.stdscr.addstr(self.height - 1, center_start, center, Colors._pair_cache[Colors.YELLOW])
             
             if right:
-                self.stdscr.addstr(self.height - 1, self.width - len(right) - 2, right, curses.color_pair(Colors.CYAN))
+                self.stdscr.addstr(self.height - 1, self.width - len(right) - 2, right, Colors._pair_cache[Colors.CYAN])
         except curses.error:
             pass
 
@@ -463,8 +658,10 @@ class UITerminal:
         self.menu_panel = None
         self.status_bar = None
         self.panels = []
-        self.key_queue = []
+        # Keys injected from the API server thread; deque append/popleft are thread-safe.
+        self.key_queue = deque()
         self.ready = False
+        self._screen_size = None
     
     def init_screen(self):
         """Initialize curses screen with proper terminal setup."""
@@ -475,10 +672,12 @@ class UITerminal:
         Colors.init_pairs(self.stdscr)
         curses.curs_set(1)
         
-        # Send terminal setup sequences for better compatibility
-        self.stdscr.addstr("\033[?1049h")  # Enable alternate screen
-        self.stdscr.addstr("\033[?1h")     # Enable application cursor
-        self.stdscr.addstr("\033[?25l")    # Hide cursor initially
+        # Send terminal setup sequences for better compatibility: alternate
+        # screen, application cursor keys, hidden cursor. These are raw VT
+        # sequences, so they go straight to the terminal in one write rather
+        # than into the curses cell buffer.
+        sys.stdout.write(TERMINAL_ENTER_SEQ)
+        sys.stdout.flush()
         self.stdscr.refresh()
     
     def setup_panels(self, height: int, width: int):
@@ -504,28 +703,53 @@ class UITerminal:
                 curses.curs_set(0)
                 # Save cursor position and move to known location
                 self.stdscr.addstr(curses.LINES - 1, 0, "\n")
-                # Send proper exit sequences for problematic terminals
-                self.stdscr.addstr("\033[?1049l")  # Disable alternate screen
-                self.stdscr.addstr("\033[?1l")     # Disable application cursor
-                self.stdscr.addstr("\033[?25h")    # Show cursor (normal state)
                 self.stdscr.refresh()
                 curses.nocbreak()
                 self.stdscr.keypad(False)
                 curses.echo()
                 curses.endwin()
+                # Send proper exit sequences for problematic terminals
+                sys.stdout.write(TERMINAL_EXIT_SEQ)
+                sys.stdout.flush()
         except curses.error:
             pass
     
-    def render(self):
-        """Render all panels."""
+    def render(self, force: bool = False):
+        """Render panels that changed and refresh only if something was drawn.
+        
+        Buffered panel updates are flushed first; pass force=True to bypass
+        the flush throttle when the caller is about to block.
+        """
+        size = self.stdscr.getmaxyx()
+        if size != self._screen_size:
+            self._screen_size = size
+            self.invalidate()
+        
+        drew = False
         for panel in self.panels:
-            panel.render()
-        self.stdscr.refresh()
+            panel.flush(force)
+            if panel.render():
+                panel.win.noutrefresh()
+                drew = True
+        if self.status_bar and self.status_bar.pending_refresh:
+            self.status_bar.pending_refresh = False
+            drew = True
+        if drew:
+            self.stdscr.noutrefresh()
+            curses.doupdate()
     
     def clear(self):
         """Clear screen."""
         self.stdscr.clear()
     
+    def invalidate(self):
+        """Clear the screen and force every panel to redraw on the next render."""
+        self.clear()
+        for panel in self.panels:
+            panel.invalidate()
+        if self.status_bar:
+            self.status_bar.invalidate()
+    
     def show_menu(self, title: str, items: List[str], on_select: Optional[Callable] = None) -> int:
         """Show a modal menu."""
         height = min(len(items) + 4, 20)
@@ -540,16 +764,17 @@ class UITerminal:
         )
         menu_panel.set_items(items, on_select)
         menu_panel.render()
-        self.stdscr.refresh()
+        menu_panel.win.refresh()
         
         while True:
-            key = self.stdscr.getch()
+            key = self.wait_key()
             result = menu_panel.handle_input(key)
             if result is not None:
                 menu_panel.clear()
+                self.invalidate()
                 return result
             menu_panel.render()
-            self.stdscr.refresh()
+            menu_panel.win.refresh()
     
     def show_form(self, title: str, fields: List[str], defaults: List[str] = None) -> List[str]:
         """Show a form for input."""
@@ -568,7 +793,7 @@ class UITerminal:
         self.stdscr.clear()
         
         try:
-            self.stdscr.addstr(y, x + (form_width - len(title)) // 2, title, curses.color_pair(Colors.CYAN))
+            self.stdscr.addstr(y, x + (form_width - len(title)) // 2, title, Colors._pair_cache[Colors.CYAN])
             
             for i, field in enumerate(fields):
                 self.stdscr.addstr(y + 2 + i * 2, x + 2, field + ":")
@@ -576,16 +801,22 @@ class UITerminal:
             
             self.stdscr.addstr(y + form_height - 2, x + 2, "[Enter] Submit  [Esc] Cancel")
             
+            drawn_field = -1
             while current_field < len(fields):
-                self.stdscr.move(y + 2 + current_field * 2, x + len(fields[current_field]) + 4 + len(results[current_field]))
-                self.stdscr.refresh()
+                row = y + 2 + current_field * 2
+                col = x + len(fields[current_field]) + 4
+                
+                # Rewrite the whole value once when a field gains focus;
+                # after that each key only touches the cell it changed.
+                if drawn_field != current_field:
+                    self.stdscr.addstr(row, col, " " * (form_width - len(fields[current_field]) - 10))
+                    self.stdscr.addstr(row, col, results[current_field])
+                    drawn_field = current_field
                 
-                self.stdscr.addstr(y + 2 + current_field * 2, x + len(fields[current_field]) + 4, " " * (form_width - len(fields[current_field]) - 10))
-                self.stdscr.addstr(y + 2 + current_field * 2, x + len(fields[current_field]) + 4, results[current_field])
-                self.stdscr.move(y + 2 + current_field * 2, x + len(fields[current_field]) + 4 + len(results[current_field]))
+                self.stdscr.move(row, col + len(results[current_field]))
                 self.stdscr.refresh()
                 
-                key = self.stdscr.getch()
+                key = self.wait_key()
                 
                 if key in (curses.KEY_ENTER, 10, 13):
                     current_field += 1
@@ -594,11 +825,15 @@ class UITerminal:
                 elif key == curses.KEY_BACKSPACE or key in (127, 8):
                     if results[current_field]:
                         results[current_field] = results[current_field][:-1]
+                        self.stdscr.addch(row, col + len(results[current_field]), ord(" "))
                 elif 32 <= key <= 126:
                     if len(results[current_field]) < form_width - len(fields[current_field]) - 10:
                         results[current_field] += chr(key)
+                        self.stdscr.addch(row, col + len(results[current_field]) - 1, key)
         except curses.error:
             pass
+        finally:
+            self.invalidate()
         
         return results
     
@@ -612,13 +847,13 @@ class UITerminal:
         x = (curses.COLS - width) // 2
         
         try:
-            self.stdscr.addstr(y, x, "┌" + "─" * (width - 2) + "┐", curses.color_pair(Colors.CYAN))
-            self.stdscr.addstr(y, x + (width - len(title)) // 2, title, curses.color_pair(Colors.CYAN) | curses.A_REVERSE)
-            self.stdscr.addstr(y + 1, x, "│", curses.color_pair(Colors.CYAN))
-            self.stdscr.addstr(y + 1, x + width - 1, "│", curses.color_pair(Colors.CYAN))
-            self.stdscr.addstr(y + 2, x, "│", curses.color_pair(Colors.CYAN))
-            self.stdscr.addstr(y + 2, x + width - 1, "│", curses.color_pair(Colors.CYAN))
-            self.stdscr.addstr(y + 3, x, "└" + "─" * (width - 2) + "┘", curses.color_pair(Colors.CYAN))
+            self.stdscr.addstr(y, x, "┌" + "─" * (width - 2) + "┐", Colors._pair_cache[Colors.CYAN])
+            self.stdscr.addstr(y, x + (width - len(title)) // 2, title, Colors._pair_cache[Colors.CYAN] | curses.A_REVERSE)
+            self.stdscr.addstr(y + 1, x, "│", Colors._pair_cache[Colors.CYAN])
+            self.stdscr.addstr(y + 1, x + width - 1, "│", Colors._pair_cache[Colors.CYAN])
+            self.stdscr.addstr(y + 2, x, "│", Colors._pair_cache[Colors.CYAN])
+            self.stdscr.addstr(y + 2, x + width - 1, "│", Colors._pair_cache[Colors.CYAN])
+            self.stdscr.addstr(y + 3, x, "└" + "─" * (width - 2) + "┘", Colors._pair_cache[Colors.CYAN])
             
             for i, line in enumerate(lines):
                 display_line = line[:width - 4]
@@ -626,9 +861,31 @@ class UITerminal:
             
             self.stdscr.addstr(y + height - 1, x + (width - 15) // 2, "[ Press any key ]")
             self.stdscr.refresh()
-            self.stdscr.getch()
+            self.wait_key()
         except curses.error:
             pass
+        finally:
+            self.invalidate()
+
+    def read_key(self, win=None, timeout_ms: int = 0) -> int:
+        """Read a key from the terminal, falling back to injected keys.
+        
+        Waits up to timeout_ms for terminal input unless an injected key is
+        already queued. Returns curses.ERR if nothing arrived.
+        """
+        win = win or self.stdscr
+        win.timeout(0 if self.key_queue else timeout_ms)
+        key = win.getch()
+        if key == curses.ERR and self.key_queue:
+            key = self.key_queue.popleft()
+        return key
+    
+    def wait_key(self) -> int:
+        """Block until a key arrives from the terminal or the injected key queue."""
+        while True:
+            key = self.read_key(timeout_ms=FRAME_INTERVAL_MS)
+            if key != curses.ERR:
+                return key
 
     def inject_key(self, key: str) -> bool:
         """Inject a keystroke into the TUI. Returns True if accepted."""
@@ -681,14 +938,13 @@ class UITerminal:
             height, width = self.stdscr.getmaxyx()
             lines = []
             for y in range(height):
-                row = []
-                for x in range(width - 1):
-                    try:
-                        char = self.stdscr.instr(y, x, 1).decode('utf-8', errors='replace')
-                        row.append(char)
-                    except:
-                        row.append(' ')
-                lines.append(''.join(row))
+                try:
+                    # instr counts bytes, so read the whole row and trim
+                    # after decoding to keep multibyte border glyphs intact.
+                    raw = self.stdscr.instr(y, 0)
+                    lines.append(raw.decode('utf-8', errors='replace')[:width - 1].ljust(width - 1))
+                except curses.error:
+                    lines.append(' ' * (width - 1))
             return '\n'.join(lines)
         except curses.error:
             return ""
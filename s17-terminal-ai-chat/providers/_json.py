@@ -0,0 +1,26 @@
+"""JSON encoding for provider request and response bodies."""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+if HAS_ORJSON:
+    loads = orjson.loads
+    dumps = orjson.dumps
+else:
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_body(headers: Dict[str, str], data: Any) -> Dict[str, Any]:
+    """Encode a JSON request body as httpx keyword arguments."""
+    return {"headers": {**headers, "Content-Type": "application/json"}, "content": dumps(data)}
@@ -0,0 +1,115 @@
+"""On-disk cache for provider model metadata."""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Bump when the shape of cached values changes; older entries are ignored.
+CACHE_VERSION = 1
+
+DEFAULT_PATH = "~/.cache/term-ai/models.json"
+
+# Model lists and details change rarely; refetch them daily.
+MODEL_TTL = 24 * 3600
+
+
+class MetaCache:
+    """JSON file of cached values, each stored with its fetch time and version."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = os.path.expanduser(path)
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cache file once per process."""
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        """Write the cache file atomically; failures leave the cache in memory only."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def get(self, key: str, ttl: float) -> Optional[Any]:
+        """Get a value fetched less than ttl seconds ago, or None."""
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry or entry.get("version") != CACHE_VERSION:
+            return None
+        if time.time() - entry.get("fetched_at", 0) > ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any):
+        """Store a value and persist the cache."""
+        with self._lock:
+            self._load()[key] = {"value": value, "fetched_at": time.time(), "version": CACHE_VERSION}
+            self._save()
+
+    def invalidate(self, prefix: str):
+        """Drop every entry whose key starts with prefix."""
+        with self._lock:
+            entries = self._load()
+            stale = [key for key in entries if key.startswith(prefix)]
+            for key in stale:
+                del entries[key]
+            if stale:
+                self._save()
+
+
+meta_cache = MetaCache()
+
+
+def credential_digest(provider: Any) -> str:
+    """Digest of the provider's API key, so keys never reach the cache file."""
+    api_key = provider.api_key or ""
+    return hashlib.blake2b(api_key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cache_prefix(provider: Any) -> str:
+    """Key prefix shared by all cached metadata of one provider endpoint and key."""
+    return f"{type(provider).__name__}|{provider.base_url}|{credential_digest(provider)}|"
+
+
+def cache_key(provider: Any, method_name: str, *args: Any) -> str:
+    """Key of one cached method result."""
+    return cache_prefix(provider) + "|".join((method_name, *map(str, args)))
+
+
+def disk_cached(ttl: float) -> Callable:
+    """
+    Cache a provider method's result on disk for ttl seconds.
+
+    Keys combine the provider class, base URL, API key digest, method name
+    and arguments.
+    Empty results are not cached so a failed lookup is retried next time.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            key = cache_key(self, method.__name__, *args)
+            value = meta_cache.get(key, ttl)
+            if value is not None:
+                return value
+            value = method(self, *args)
+            if value:
+                meta_cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
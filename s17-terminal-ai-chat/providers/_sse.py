@@ -0,0 +1,65 @@
+"""Incremental line and Server-Sent Events parsing for streaming providers."""
+
+from typing import Iterable, Iterator, List, Tuple
+
+# Nearly every line of a token stream is a data line, so it gets a fast path.
+_DATA_PREFIX = b"data: "
+
+
+def iter_lines(byte_iter: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Split a byte stream into lines without decoding it.
+
+    Line endings (LF or CRLF) are stripped; a final unterminated line is
+    yielded too.
+    """
+    pending = b""
+
+    for chunk in byte_iter:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line[:-1] if line.endswith(b"\r") else line
+
+    if pending:
+        yield pending[:-1] if pending.endswith(b"\r") else pending
+
+
+def sse_events(byte_iter: Iterable[bytes]) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Parse a Server-Sent Events byte stream.
+
+    Args:
+        byte_iter: Raw response chunks, split at arbitrary points
+
+    Yields:
+        (event, data) byte strings per dispatched event; event defaults to
+        b"message" and multi-line data is joined with newlines
+    """
+    event = b""
+    data: List[bytes] = []
+
+    for line in iter_lines(byte_iter):
+        if line.startswith(_DATA_PREFIX):
+            data.append(line[6:])
+            continue
+
+        if not line:
+            if data:
+                yield event or b"message", b"\n".join(data)
+            event = b""
+            data = []
+            continue
+
+        field, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+
+        if field == b"data":
+            data.append(value)
+        elif field == b"event":
+            event = value
+        # Comments (empty field name), id and retry are not used.
+
+    if data:
+        yield event or b"message", b"\n".join(data)
@@ -1,23 +1,50 @@
 """Anthropic provider implementation."""
 
-import json
-import time
-import httpx
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 
+from providers._json import json_body, loads
+from providers._sse import sse_events
 from providers.base import Provider
 
 
+_ANTHROPIC_MODEL_INFO = {
+    "claude-3-5-sonnet-20241022": {"context_window": 200000, "max_tokens": 8192},
+    "claude-3-5-sonnet-20240620": {"context_window": 200000, "max_tokens": 8192},
+    "claude-3-opus-20240229": {"context_window": 200000, "max_tokens": 4096},
+    "claude-3-haiku-20240307": {"context_window": 200000, "max_tokens": 4096},
+    "claude-2.1": {"context_window": 200000, "max_tokens": 4096},
+    "claude-2.0": {"context_window": 100000, "max_tokens": 4096},
+    "claude-instant-1.2": {"context_window": 100000, "max_tokens": 4096}
+}
+
+_ANTHROPIC_MODEL_IDS = tuple(_ANTHROPIC_MODEL_INFO)
+
+
+def _split_system(messages: List[Dict[str, str]]) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """
+    Separate the system prompt, which Anthropic takes as its own field.
+    
+    Returns:
+        (content of the last system message or None, the other messages);
+        messages itself is returned when it has no system message
+    """
+    system_indexes = [i for i, msg in enumerate(messages) if msg["role"] == "system"]
+    if not system_indexes:
+        return None, messages
+    
+    system_message = messages[system_indexes[-1]]["content"]
+    if system_indexes == [0]:
+        return system_message, messages[1:]
+    return system_message, [msg for msg in messages if msg["role"] != "system"]
+
+
 class AnthropicProvider(Provider):
     """Anthropic API provider."""
     
-    def __init__(self, config: Dict[str, Any]):
-        super().__init__(config)
-        self.client = httpx.Client(timeout=120.0)
-        self._models_cache = None
+    timeout = 120.0
     
-    def chat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None) -> tuple[str, Dict]:
-        """Send chat message to Anthropic."""
+    def _build_chat_request(self, messages: List[Dict[str, str]], model_id: Optional[str]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build an Anthropic messages request."""
         if not model_id:
             model_id = "claude-3-5-sonnet-20241022"
         
@@ -32,14 +59,7 @@ class AnthropicProvider(Provider):
         if self.extra.get("organization"):
             headers["organization"] = self.extra["organization"]
         
-        system_message = None
-        formatted_messages = []
-        
-        for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-            else:
-                formatted_messages.append(msg)
+        system_message, formatted_messages = _split_system(messages)
         
         data = {
             "model": model_id,
@@ -50,13 +70,10 @@ class AnthropicProvider(Provider):
         if system_message:
             data["system"] = system_message
         
-        start_time = time.time()
-        
-        response = self.client.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        result = response.json()
-        
+        return url, headers, data
+    
+    def _parse_chat_response(self, result: Dict[str, Any]) -> tuple[str, Dict]:
+        """Parse an Anthropic messages response."""
         content = result["content"][0]["text"]
         
         usage = result.get("usage", {})
@@ -80,14 +97,7 @@ class AnthropicProvider(Provider):
             "anthropic-version": "2023-06-01",
         }
         
-        system_message = None
-        formatted_messages = []
-        
-        for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-            else:
-                formatted_messages.append(msg)
+        system_message, formatted_messages = _split_system(messages)
         
         data = {
             "model": model_id,
@@ -99,64 +109,32 @@ class AnthropicProvider(Provider):
         if system_message:
             data["system"] = system_message
         
-        with self.client.stream("POST", url, headers=headers, json=data) as response:
+        with self.client.stream("POST", url, timeout=self.timeout, **json_body(headers, data)) as response:
             response.raise_for_status()
             
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode("utf-8")
-                    if line == "event: ping":
-                        continue
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        try:
-                            chunk = json.loads(data_str)
-                            if chunk.get("type") == "content_block_delta":
-                                delta = chunk.get("delta", {})
-                                content = delta.get("text", "")
-                                if content:
-                                    yield content
-                        except json.JSONDecodeError:
-                            pass
+            for event, payload in sse_events(response.iter_bytes()):
+                # Only delta events carry text; skip decoding pings and metadata.
+                if event != b"content_block_delta":
+                    continue
+                try:
+                    chunk = loads(payload)
+                except ValueError:
+                    continue
+                content = chunk.get("delta", {}).get("text")
+                if content:
+                    yield content
     
     def get_models(self) -> List[str]:
         """Get list of available Anthropic models."""
-        if self._models_cache:
-            return self._models_cache
-        
-        model_ids = [
-            "claude-3-5-sonnet-20241022",
-            "claude-3-5-sonnet-20240620",
-            "claude-3-opus-20240229",
-            "claude-3-haiku-20240307",
-            "claude-2.1",
-            "claude-2.0",
-            "claude-instant-1.2"
-        ]
-        
-        self._models_cache = model_ids
-        return model_ids
+        return list(_ANTHROPIC_MODEL_IDS)
     
     def get_model_info(self, model_id: str) -> Dict[str, Any]:
         """Get information about a specific Anthropic model."""
-        models = {
-            "claude-3-5-sonnet-20241022": {"context_window": 200000, "max_tokens": 8192},
-            "claude-3-5-sonnet-20240620": {"context_window": 200000, "max_tokens": 8192},
-            "claude-3-opus-20240229": {"context_window": 200000, "max_tokens": 4096},
-            "claude-3-haiku-20240307": {"context_window": 200000, "max_tokens": 4096},
-            "claude-2.1": {"context_window": 200000, "max_tokens": 4096},
-            "claude-2.0": {"context_window": 100000, "max_tokens": 4096},
-            "claude-instant-1.2": {"context_window": 100000, "max_tokens": 4096}
-        }
-        
-        if model_id in models:
-            return {
-                "id": model_id,
-                "provider": "anthropic",
-                **models[model_id]
-            }
+        info = _ANTHROPIC_MODEL_INFO.get(model_id)
+        if info is None:
+            raise ValueError(f"Model not found: {model_id}")
         
-        raise ValueError(f"Model not found: {model_id}")
+        return {"id": model_id, "provider": "anthropic", **info}
     
     def validate_config(self) -> bool:
         """Validate Anthropic configuration."""
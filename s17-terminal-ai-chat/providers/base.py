@@ -1,19 +1,135 @@
 """Base provider class."""
 
+import asyncio
+import hashlib
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Iterator
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables httpx's HTTP/2 transport)
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+from providers._json import json_body, loads
+from providers._meta_cache import cache_prefix, credential_digest, meta_cache
+
+
+@lru_cache(maxsize=None)
+def _get_shared_client() -> httpx.Client:
+    """Get the process-wide HTTP client.
+    
+    All providers share one connection pool so requests to the same host
+    reuse keep-alive connections across provider instances. Timeouts are
+    passed per request, so one pool serves every provider. With h2
+    installed, concurrent requests to a host multiplex over one HTTP/2
+    connection instead of opening one connection each.
+    """
+    return httpx.Client(
+        http2=HAS_HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=100, keepalive_expiry=90),
+    )
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of chat responses with per-entry expiry."""
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def put(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds, evicting the least recently used."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._data.clear()
+
+
+_response_cache = ResponseCache()
+
+# Seconds to keep a fetched model list in memory, and a failed fetch's fallback.
+MODELS_TTL = 300.0
+MODELS_ERROR_TTL = 30.0
+
+# Futures of chat calls in progress, by request hash.
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
 
 
 class Provider(ABC):
     """Abstract base class for AI providers."""
     
+    # Default request timeout in seconds; subclasses override it.
+    timeout: float = 60.0
+    
     def __init__(self, config: Dict[str, Any]):
         self.name = config.get("name", "unknown")
         self.api_key = config.get("api_key")
         self.base_url = config.get("base_url", "")
         self.extra = config.get("extra", {})
+        self.client = _get_shared_client()
+        # (model ids, monotonic expiry) from the last get_models call
+        self._models_cache: Optional[Tuple[List[str], float]] = None
+        # Seconds to reuse a response for an identical request; 0 disables.
+        self.cache_ttl = float(self.extra.get("cache_ttl", 0))
+    
+    def _cache_key(self, messages: List[Dict[str, str]], model_id: Optional[str]) -> str:
+        """Hash a request, and the credentials it is sent with, into a response cache key."""
+        payload = json.dumps({
+            "p": type(self).__name__,
+            "u": self.base_url,
+            "k": credential_digest(self),
+            "o": self.extra.get("organization"),
+            "m": model_id,
+            "msgs": messages,
+        }, sort_keys=True)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _cached_response(self, key: Optional[str]) -> Optional[tuple[str, Dict]]:
+        """Look up a cached (response_text, usage_info) for key."""
+        if key is None:
+            return None
+        cached = _response_cache.get(key)
+        if cached is None:
+            return None
+        content, usage = cached
+        return content, {**usage, "cached": True}
+    
+    def _store_response(self, key: Optional[str], result: tuple[str, Dict]) -> tuple[str, Dict]:
+        """Cache a chat result under key and return it."""
+        if key is not None:
+            _response_cache.put(key, result, self.cache_ttl)
+        return result
     
-    @abstractmethod
     def chat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None) -> tuple[str, Dict]:
         """
         Send a chat message and get response.
@@ -21,6 +137,66 @@ class Provider(ABC):
         Returns:
             Tuple of (response_text, usage_info)
         """
+        request_key = self._cache_key(messages, model_id)
+        key = request_key if self.cache_ttl > 0 else None
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
+        # Identical requests already in flight share that call's result.
+        with _inflight_lock:
+            pending = _inflight.get(request_key)
+            if pending is None:
+                future = _inflight[request_key] = Future()
+        if pending is not None:
+            content, usage = pending.result()
+            return content, {**usage, "cached": True}
+        
+        try:
+            url, headers, data = self._build_chat_request(messages, model_id)
+            response = self.client.post(url, timeout=self.timeout, **json_body(headers, data))
+            response.raise_for_status()
+            result = self._store_response(key, self._parse_chat_response(loads(response.content)))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with _inflight_lock:
+                del _inflight[request_key]
+    
+    async def achat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None,
+                    client: Optional[httpx.AsyncClient] = None) -> tuple[str, Dict]:
+        """
+        Async version of chat.
+        
+        Pass an AsyncClient to share its connections across concurrent
+        calls; otherwise a client is opened for this call only.
+        """
+        key = self._cache_key(messages, model_id) if self.cache_ttl > 0 else None
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
+        url, headers, data = self._build_chat_request(messages, model_id)
+        if client is None:
+            async with httpx.AsyncClient() as own_client:
+                response = await own_client.post(url, timeout=self.timeout, **json_body(headers, data))
+        else:
+            response = await client.post(url, timeout=self.timeout, **json_body(headers, data))
+        response.raise_for_status()
+        return self._store_response(key, self._parse_chat_response(loads(response.content)))
+    
+    @abstractmethod
+    def _build_chat_request(self, messages: List[Dict[str, str]], model_id: Optional[str]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build the (url, headers, json_body) for a non-streaming chat call."""
+        pass
+    
+    @abstractmethod
+    def _parse_chat_response(self, result: Dict[str, Any]) -> tuple[str, Dict]:
+        """Extract (response_text, usage_info) from a chat response body."""
         pass
     
     @abstractmethod
@@ -43,6 +219,24 @@ class Provider(ABC):
         """Get information about a specific model."""
         pass
     
+    def _cached_models(self) -> Optional[List[str]]:
+        """Get the model list kept in memory, or None once it has expired."""
+        cached = self._models_cache
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        return None
+    
+    def _cache_models(self, models: List[str], ttl: float) -> List[str]:
+        """Keep a model list in memory for ttl seconds and return it."""
+        self._models_cache = (models, time.monotonic() + ttl)
+        return models
+    
+    def refresh_models(self) -> List[str]:
+        """Drop cached model metadata and fetch the model list again."""
+        meta_cache.invalidate(cache_prefix(self))
+        self._models_cache = None
+        return self.get_models()
+    
     def validate_config(self) -> bool:
         """Validate provider configuration."""
         return True
@@ -54,3 +248,24 @@ class Provider(ABC):
             return True
         except Exception:
             return False
+
+
+def chat_many(requests: List[Tuple[Provider, List[Dict[str, str]], Optional[str]]]) -> List[Any]:
+    """
+    Run several chat calls concurrently on one event loop.
+    
+    Args:
+        requests: (provider, messages, model_id) tuples
+    
+    Returns:
+        A (response_text, usage_info) tuple per request, in order; a failed
+        request's slot holds the exception it raised.
+    """
+    async def run_all():
+        async with httpx.AsyncClient(http2=HAS_HTTP2, limits=httpx.Limits(max_keepalive_connections=100)) as client:
+            return await asyncio.gather(
+                *(provider.achat(messages, model_id, client=client) for provider, messages, model_id in requests),
+                return_exceptions=True,
+            )
+    
+    return asyncio.run(run_all())
@@ -1,23 +1,19 @@
 """Local/custom provider implementation."""
 
-import json
-import time
-import subprocess
-import os
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 
-from providers.base import Provider
+from providers._json import json_body, loads
+from providers._sse import sse_events
+from providers.base import MODELS_ERROR_TTL, MODELS_TTL, Provider
 
 
 class LocalProvider(Provider):
     """Local model provider (via vLLM, llama.cpp, etc.)."""
     
-    def __init__(self, config: Dict[str, Any]):
-        super().__init__(config)
-        self._models_cache = None
+    timeout = 300.0
     
-    def chat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None) -> tuple[str, Dict]:
-        """Send chat message to local model."""
+    def _build_chat_request(self, messages: List[Dict[str, str]], model_id: Optional[str]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build an OpenAI-compatible chat completion request for the local server."""
         if not model_id:
             model_id = "local-model"
         
@@ -33,23 +29,18 @@ class LocalProvider(Provider):
             "max_tokens": 4096,
         }
         
-        import httpx
-        with httpx.Client(timeout=300.0) as client:
-            start_time = time.time()
-            
-            response = client.post(url, headers=headers, json=data)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            content = result["choices"][0]["message"]["content"]
-            usage = result.get("usage", {})
-            
-            return content, {
-                "tokens_in": usage.get("prompt_tokens", 0),
-                "tokens_out": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0)
-            }
+        return url, headers, data
+    
+    def _parse_chat_response(self, result: Dict[str, Any]) -> tuple[str, Dict]:
+        """Parse an OpenAI-compatible chat completion response."""
+        content = result["choices"][0]["message"]["content"]
+        usage = result.get("usage", {})
+        
+        return content, {
+            "tokens_in": usage.get("prompt_tokens", 0),
+            "tokens_out": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0)
+        }
     
     def stream_chat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None) -> Iterator[str]:
         """Stream chat response from local model."""
@@ -69,47 +60,39 @@ class LocalProvider(Provider):
             "max_tokens": 4096,
         }
         
-        import httpx
-        with httpx.Client(timeout=300.0) as client:
-            with client.stream("POST", url, headers=headers, json=data) as response:
-                response.raise_for_status()
-                
-                for line in response.iter_lines():
-                    if line:
-                        line = line.decode("utf-8")
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                break
-                            try:
-                                chunk = json.loads(data_str)
-                                if "choices" in chunk:
-                                    delta = chunk["choices"][0].get("delta", {})
-                                    content = delta.get("content", "")
-                                    if content:
-                                        yield content
-                            except json.JSONDecodeError:
-                                pass
+        with self.client.stream("POST", url, timeout=self.timeout, **json_body(headers, data)) as response:
+            response.raise_for_status()
+            
+            for _, payload in sse_events(response.iter_bytes()):
+                if payload == b"[DONE]":
+                    break
+                try:
+                    chunk = loads(payload)
+                except ValueError:
+                    continue
+                choices = chunk.get("choices")
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield content
     
     def get_models(self) -> List[str]:
         """Get list of available local models."""
-        if self._models_cache:
-            return self._models_cache
+        cached = self._cached_models()
+        if cached is not None:
+            return cached
         
         try:
             url = f"{self.base_url}/v1/models"
-            import httpx
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url)
-                if response.status_code == 200:
-                    result = response.json()
-                    model_ids = [m["id"] for m in result.get("data", [])]
-                    self._models_cache = model_ids
-                    return model_ids
+            response = self.client.get(url, timeout=10.0)
+            if response.status_code == 200:
+                result = loads(response.content)
+                model_ids = [m["id"] for m in result.get("data", [])]
+                return self._cache_models(model_ids, MODELS_TTL)
         except Exception:
             pass
         
-        return ["local-model"]
+        return self._cache_models(["local-model"], MODELS_ERROR_TTL)
     
     def get_model_info(self, model_id: str) -> Dict[str, Any]:
         """Get information about a specific local model."""
@@ -127,10 +110,8 @@ class LocalProvider(Provider):
     def health_check(self) -> bool:
         """Check if local model server is available."""
         try:
-            import httpx
             url = f"{self.base_url}/v1/models"
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(url)
-                return response.status_code == 200
+            response = self.client.get(url, timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
@@ -1,23 +1,24 @@
 """Ollama provider implementation."""
 
-import json
-import time
-import httpx
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 
-from providers.base import Provider
+from providers._json import json_body, loads
+from providers._meta_cache import MODEL_TTL, cache_key, disk_cached, meta_cache
+from providers._sse import iter_lines
+from providers.base import MODELS_ERROR_TTL, MODELS_TTL, Provider
 
 
 class OllamaProvider(Provider):
     """Ollama local API provider."""
     
+    timeout = 300.0
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.client = httpx.Client(timeout=300.0)
-        self._models_cache = None
+        self._model_info_cache: Dict[str, Dict[str, Any]] = {}
     
-    def chat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None) -> tuple[str, Dict]:
-        """Send chat message to Ollama."""
+    def _build_chat_request(self, messages: List[Dict[str, str]], model_id: Optional[str]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build an Ollama chat request."""
         if not model_id:
             model_id = "llama3.2"
         
@@ -29,13 +30,10 @@ class OllamaProvider(Provider):
             "stream": False,
         }
         
-        start_time = time.time()
-        
-        response = self.client.post(url, json=data)
-        response.raise_for_status()
-        
-        result = response.json()
-        
+        return url, {}, data
+    
+    def _parse_chat_response(self, result: Dict[str, Any]) -> tuple[str, Dict]:
+        """Parse an Ollama chat response."""
         content = result["message"]["content"]
         
         return content, {
@@ -57,56 +55,51 @@ class OllamaProvider(Provider):
             "stream": True,
         }
         
-        with self.client.stream("POST", url, json=data) as response:
+        with self.client.stream("POST", url, timeout=self.timeout, **json_body({}, data)) as response:
             response.raise_for_status()
             
-            for line in response.iter_lines():
+            for line in iter_lines(response.iter_bytes()):
                 if line:
                     try:
-                        chunk = json.loads(line)
+                        chunk = loads(line)
                         if "message" in chunk:
                             content = chunk["message"].get("content", "")
                             if content:
                                 yield content
-                    except json.JSONDecodeError:
+                    except ValueError:
                         pass
     
     def get_models(self) -> List[str]:
         """Get list of available Ollama models."""
-        if self._models_cache:
-            return self._models_cache
+        cached = self._cached_models()
+        if cached is not None:
+            return cached
         
         try:
-            url = f"{self.base_url}/api/tags"
-            response = self.client.get(url)
-            response.raise_for_status()
-            
-            result = response.json()
-            model_ids = [m["name"] for m in result.get("models", [])]
-            
-            self._models_cache = model_ids
-            return model_ids
+            return self._cache_models(self._fetch_models(), MODELS_TTL)
         except Exception:
-            return []
+            return self._cache_models([], MODELS_ERROR_TTL)
+    
+    # Not cached on disk: `ollama pull` and `ollama rm` change this list at any time.
+    def _fetch_models(self) -> List[str]:
+        """Fetch the installed model names from the Ollama server."""
+        url = f"{self.base_url}/api/tags"
+        response = self.client.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        
+        result = loads(response.content)
+        return [m["name"] for m in result.get("models", [])]
     
     def get_model_info(self, model_id: str) -> Dict[str, Any]:
         """Get information about a specific Ollama model."""
+        info = self._model_info_cache.get(model_id)
+        if info is not None:
+            return info
+        
         try:
-            url = f"{self.base_url}/api/show"
-            data = {"name": model_id}
-            
-            response = self.client.post(url, json=data)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            return {
-                "id": model_id,
-                "provider": "ollama",
-                "context_window": result.get("context_size", 4096),
-                "max_tokens": 4096,
-                "parameters": result.get("parameters", "unknown")
-            }
+            info = self._fetch_model_info(model_id)
+            self._model_info_cache[model_id] = info
+            return info
         except Exception:
             return {
                 "id": model_id,
@@ -115,6 +108,35 @@ class OllamaProvider(Provider):
                 "max_tokens": 4096
             }
     
+    def invalidate_model_info(self, model_id: str):
+        """Forget cached details of a model so the next lookup refetches them."""
+        self._model_info_cache.pop(model_id, None)
+        meta_cache.invalidate(cache_key(self, "_fetch_model_info", model_id))
+    
+    def refresh_models(self) -> List[str]:
+        """Drop cached model metadata and fetch the model list again."""
+        self._model_info_cache.clear()
+        return super().refresh_models()
+    
+    @disk_cached(MODEL_TTL)
+    def _fetch_model_info(self, model_id: str) -> Dict[str, Any]:
+        """Fetch model details from the Ollama server."""
+        url = f"{self.base_url}/api/show"
+        data = {"name": model_id}
+        
+        response = self.client.post(url, timeout=self.timeout, **json_body({}, data))
+        response.raise_for_status()
+        
+        result = loads(response.content)
+        
+        return {
+            "id": model_id,
+            "provider": "ollama",
+            "context_window": result.get("context_size", 4096),
+            "max_tokens": 4096,
+            "parameters": result.get("parameters", "unknown")
+        }
+    
     def validate_config(self) -> bool:
         """Validate Ollama configuration."""
         return True
@@ -130,13 +152,23 @@ class OllamaProvider(Provider):
     
     def pull_model(self, model_id: str) -> bool:
         """Pull a model from Ollama registry."""
+        # Ask the server, not the model cache: the model may have been removed since.
+        try:
+            models = self._fetch_models()
+        except Exception:
+            models = []
+        if model_id in models or f"{model_id}:latest" in models:
+            return True
+        
         try:
             url = f"{self.base_url}/api/pull"
             data = {"name": model_id, "stream": False}
             
-            response = self.client.post(url, json=data)
+            response = self.client.post(url, timeout=self.timeout, **json_body({}, data))
             response.raise_for_status()
             
+            self.invalidate_model_info(model_id)
+            self.refresh_models()
             return True
         except Exception:
             return False
@@ -1,23 +1,20 @@
 """OpenAI provider implementation."""
 
-import json
-import time
-import httpx
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 
-from providers.base import Provider
+from providers._json import json_body, loads
+from providers._meta_cache import MODEL_TTL, disk_cached
+from providers._sse import sse_events
+from providers.base import MODELS_TTL, Provider
 
 
 class OpenAIProvider(Provider):
     """OpenAI API provider."""
     
-    def __init__(self, config: Dict[str, Any]):
-        super().__init__(config)
-        self.client = httpx.Client(timeout=60.0)
-        self._models_cache = None
+    timeout = 60.0
     
-    def chat(self, messages: List[Dict[str, str]], model_id: Optional[str] = None) -> tuple[str, Dict]:
-        """Send chat message to OpenAI."""
+    def _build_chat_request(self, messages: List[Dict[str, str]], model_id: Optional[str]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build an OpenAI chat completion request."""
         if not model_id:
             model_id = "gpt-4o"
         
@@ -37,13 +34,10 @@ class OpenAIProvider(Provider):
             "max_tokens": 4096,
         }
         
-        start_time = time.time()
-        
-        response = self.client.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        result = response.json()
-        
+        return url, headers, data
+    
+    def _parse_chat_response(self, result: Dict[str, Any]) -> tuple[str, Dict]:
+        """Parse an OpenAI chat completion response."""
         usage = result.get("usage", {})
         content = result["choices"][0]["message"]["content"]
         
@@ -72,44 +66,47 @@ class OpenAIProvider(Provider):
             "max_tokens": 4096,
         }
         
-        with self.client.stream("POST", url, headers=headers, json=data) as response:
+        with self.client.stream("POST", url, timeout=self.timeout, **json_body(headers, data)) as response:
             response.raise_for_status()
             
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode("utf-8")
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        if data_str == "[DONE]":
-                            break
-                        try:
-                            chunk = json.loads(data_str)
-                            if "choices" in chunk:
-                                delta = chunk["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                        except json.JSONDecodeError:
-                            pass
+            for _, payload in sse_events(response.iter_bytes()):
+                if payload == b"[DONE]":
+                    break
+                try:
+                    chunk = loads(payload)
+                except ValueError:
+                    continue
+                choices = chunk.get("choices")
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield content
     
     def get_models(self) -> List[str]:
         """Get list of available OpenAI models."""
-        if self._models_cache:
-            return self._models_cache
+        cached = self._cached_models()
+        if cached is not None:
+            return cached
         
+        return self._cache_models(self._fetch_models(), MODELS_TTL)
+    
+    @disk_cached(MODEL_TTL)
+    def _fetch_models(self) -> List[str]:
+        """Fetch the model ids available to this API key."""
+        return self._request_models()
+    
+    def _request_models(self) -> List[str]:
+        """Request the model ids available to this API key, bypassing caches."""
         url = f"{self.base_url}/models"
         
         headers = {"Authorization": f"Bearer {self.api_key}"}
         
-        response = self.client.get(url, headers=headers)
+        response = self.client.get(url, headers=headers, timeout=self.timeout)
         response.raise_for_status()
         
-        result = response.json()
-        
-        model_ids = [m["id"] for m in result.get("data", [])]
+        result = loads(response.content)
         
-        self._models_cache = model_ids
-        return model_ids
+        return [m["id"] for m in result.get("data", [])]
     
     def get_model_info(self, model_id: str) -> Dict[str, Any]:
         """Get information about a specific OpenAI model."""
@@ -130,8 +127,9 @@ class OpenAIProvider(Provider):
         if not self.api_key:
             return False
         
+        # A cached model list cannot tell whether the key still works.
         try:
-            self.get_models()
+            self._request_models()
             return True
         except Exception:
             return False
@@ -1,14 +1,29 @@
 """Scheduler for automated tasks."""
 
+import heapq
+import itertools
+import math
+import sys
 import threading
 import time
-import sched
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from dataclasses import dataclass, field
 
 
-@dataclass
+# Seconds between runs for the fixed schedule types.
+SCHEDULE_PERIODS = {
+    "hourly": 3600.0,
+    "daily": 86400.0,
+    "weekly": 604800.0,
+}
+
+# Tasks due this close together are dispatched in the same wakeup.
+BATCH_WINDOW = 0.005
+
+
+@dataclass(slots=True)
 class ScheduledTask:
     """Scheduled task representation."""
     
@@ -21,41 +36,77 @@ class ScheduledTask:
     enabled: bool
     last_run: Optional[str]
     callback: Optional[Callable] = None
+    _interval_seconds: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _last_run_cache: Tuple[Optional[str], Optional[datetime]] = field(default=(None, None), init=False, repr=False, compare=False)
     
-    def get_next_run(self) -> Optional[datetime]:
-        """Calculate next run time."""
-        if not self.enabled:
-            return None
-        
-        now = datetime.now()
-        
+    def __post_init__(self):
+        self.schedule_type = sys.intern(self.schedule_type)
         if self.schedule_type == "interval":
             try:
-                minutes = int(self.schedule_value)
-                return now + timedelta(minutes=minutes)
+                self._interval_seconds = int(self.schedule_value) * 60.0
             except ValueError:
-                return None
-        
-        elif self.schedule_type == "hourly":
-            return now + timedelta(hours=1)
+                self._interval_seconds = None
+        else:
+            self._interval_seconds = SCHEDULE_PERIODS.get(self.schedule_type)
+    
+    def _last_run_dt(self) -> Optional[datetime]:
+        """Parse last_run, reusing the previous result while it is unchanged."""
+        source, parsed = self._last_run_cache
+        if source != self.last_run:
+            try:
+                parsed = datetime.fromisoformat(self.last_run) if self.last_run else None
+            except ValueError:
+                parsed = None
+            self._last_run_cache = (self.last_run, parsed)
+        return parsed
+    
+    def _seconds_until_next_run(self) -> Optional[float]:
+        """
+        Seconds from now until the next run.
         
-        elif self.schedule_type == "daily":
-            return now + timedelta(days=1)
+        Runs stay on the cadence set by the last run: the next one is the
+        first whole number of periods after last_run that is still ahead.
+        """
+        interval = self._interval_seconds
+        if not self.enabled or not interval or interval <= 0:
+            return None
         
-        elif self.schedule_type == "weekly":
-            return now + timedelta(weeks=1)
+        anchor = self._last_run_dt()
+        if anchor is None:
+            return interval
         
-        return None
+        elapsed = time.time() - anchor.timestamp()
+        periods = max(1, math.ceil(elapsed / interval))
+        return periods * interval - elapsed
+    
+    def get_next_run(self) -> Optional[datetime]:
+        """Calculate next run time."""
+        seconds = self._seconds_until_next_run()
+        if seconds is None:
+            return None
+        return datetime.now() + timedelta(seconds=seconds)
+    
+    def next_monotonic(self) -> Optional[float]:
+        """Calculate next run time on the time.monotonic() clock."""
+        seconds = self._seconds_until_next_run()
+        if seconds is None:
+            return None
+        return time.monotonic() + seconds
 
 
 class Scheduler:
     """Task scheduler for automated AI tasks."""
     
-    def __init__(self):
-        self.scheduler = sched.scheduler(time.time, time.sleep)
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
         self.tasks: Dict[str, ScheduledTask] = {}
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        # (due time on the monotonic clock, tie-breaker, task); guarded by _cv
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
     
     def add_task(self, task: ScheduledTask):
         """Add a task to the scheduler."""
@@ -72,33 +123,88 @@ class Scheduler:
         if not task.enabled:
             return
         
-        next_run = task.get_next_run()
-        if next_run:
-            delay = (next_run - datetime.now()).total_seconds()
-            if delay > 0:
-                self.scheduler.enter(delay, 1, self._run_task, (task,))
+        due = task.next_monotonic()
+        if due is not None:
+            with self._cv:
+                heapq.heappush(self._heap, (due, next(self._seq), task))
+                self._cv.notify()
+    
+    def _loop(self):
+        """Run due tasks until stopped, sleeping until the next one is due."""
+        with self._cv:
+            while self.running:
+                if not self._heap:
+                    self._cv.wait()
+                    continue
+                
+                now = time.monotonic()
+                delay = self._heap[0][0] - now
+                if delay > 0:
+                    self._cv.wait(timeout=delay)
+                    continue
+                
+                # Take everything due within the batch window in one wakeup.
+                due = []
+                horizon = now + BATCH_WINDOW
+                while self._heap and self._heap[0][0] <= horizon:
+                    task = heapq.heappop(self._heap)[2]
+                    # Removed or replaced tasks are dropped lazily here.
+                    if self.tasks.get(task.id) is task:
+                        due.append(task)
+                
+                self._cv.release()
+                try:
+                    for task in due:
+                        self._run_task(task)
+                finally:
+                    self._cv.acquire()
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool that runs task callbacks, creating it if needed."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sched")
+        return self._pool
     
     def _run_task(self, task: ScheduledTask):
-        """Execute a scheduled task."""
-        if task.callback:
-            try:
-                task.callback(task)
-                task.last_run = datetime.now().isoformat()
-            except Exception as e:
-                print(f"Error running task {task.name}: {e}")
+        """Execute a scheduled task on the worker pool."""
+        if not task.callback:
+            self._schedule_task(task)
+            return
+        
+        started = datetime.now().isoformat()
+        future = self._executor().submit(task.callback, task)
+        future.add_done_callback(lambda f: self._on_done(task, f, started))
+    
+    def _on_done(self, task: ScheduledTask, future: Future, started: str):
+        """Record a finished run and schedule the task's next one."""
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        if error is None:
+            # Start time, so the next run keeps the cadence instead of drifting by the run time.
+            task.last_run = started
+        else:
+            print(f"Error running task {task.name}: {error}")
         
         self._schedule_task(task)
     
     def start(self):
         """Start the scheduler."""
         self.running = True
-        self.thread = threading.Thread(target=self.scheduler.run, daemon=True)
+        self.thread = threading.Thread(target=self._loop, daemon=True)
         self.thread.start()
     
     def stop(self):
         """Stop the scheduler."""
-        self.running = False
-        self.scheduler.clear()
+        with self._cv:
+            self.running = False
+            self._heap.clear()
+            self._cv.notify_all()
+        
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
     
     def get_tasks(self) -> List[ScheduledTask]:
         """Get all scheduled tasks."""
@@ -112,7 +218,7 @@ class Scheduler:
         """Run a task immediately."""
         task = self.tasks.get(task_id)
         if task and task.callback:
-            threading.Thread(target=task.callback, args=(task,)).start()
+            self._executor().submit(task.callback, task)
     
     def get_status(self) -> Dict[str, Any]:
         """Get scheduler status."""
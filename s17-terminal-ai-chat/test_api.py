@@ -17,30 +17,87 @@ Usage:
 """
 
 import argparse
+import asyncio
+import http.client
 import json
-import urllib.request
-import urllib.error
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 API_BASE = "http://localhost:8080"
 
+# One keep-alive connection per thread, reused by all of its requests.
+_API_URL = urlsplit(API_BASE)
+_local = threading.local()
+
+# Request headers never change; http.client only reads them.
+_HEADERS = {"Content-Type": "application/json"}
+
+# Screens mentioning either word are flagged by the exploration summary.
+_ISSUE_RE = re.compile(r"error|fail", re.IGNORECASE)
+
+
+if HAS_ORJSON:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(data) -> bytes:
+        """Encode data as compact JSON bytes."""
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+
+# Errors from a kept-alive connection the server closed before replying.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def _connection() -> http.client.HTTPConnection:
+    """Get this thread's connection to the API server."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = http.client.HTTPConnection(_API_URL.hostname, _API_URL.port, timeout=30)
+    return conn
+
 
 def make_request(method: str, path: str, data: dict = None) -> dict:
     """Make HTTP request to API server."""
-    url = f"{API_BASE}{path}"
-    headers = {"Content-Type": "application/json"}
+    body = _dumps(data) if data else None
+    return _request_raw(method, path, body)
 
-    req = urllib.request.Request(url, method=method, headers=headers)
-    if data:
-        req.data = json.dumps(data).encode()
 
-    try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        return {"error": f"HTTP {e.code}: {e.read().decode()}"}
-    except urllib.error.URLError as e:
-        return {"error": f"Connection failed: {e}"}
+def _request_raw(method: str, path: str, body: bytes = None) -> dict:
+    """Make HTTP request to API server with an already encoded JSON body."""
+    conn = _connection()
+
+    # A kept-alive connection may have been closed by the server; reconnect once.
+    # Other failures, timeouts included, may have reached the server, so
+    # resending them could run a POST twice.
+    for attempt in range(2):
+        try:
+            conn.request(method, path, body, _HEADERS)
+            response = conn.getresponse()
+            payload = response.read()
+            break
+        except _STALE_CONNECTION_ERRORS as e:
+            conn.close()
+            if attempt:
+                return {"error": f"Connection failed: {e}"}
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            return {"error": f"Connection failed: {e}"}
+
+    if response.status >= 400:
+        return {"error": f"HTTP {response.status}: {payload.decode()}"}
+    return _loads(payload)
 
 
 def cmd_health():
@@ -151,137 +208,260 @@ def cmd_tui_keys(keys: str, delay: float = 0.1):
     return all(r.get("success", False) for r in result.get("results", []))
 
 
-def cmd_run_tests():
-    """Run comprehensive tests and report results."""
-    print("=" * 60)
-    print("Terminal AI Chat App - Test Suite")
-    print("=" * 60)
-    print()
-
-    tests = [
-        ("Health Check", lambda: make_request("GET", "/health")),
-        ("List Providers", lambda: make_request("GET", "/providers")),
-        ("List Models", lambda: make_request("GET", "/models")),
-        ("List Agents", lambda: make_request("GET", "/agents")),
-        ("List Sessions", lambda: make_request("GET", "/sessions")),
-        ("TUI Screen", lambda: make_request("GET", "/screen")),
-        ("TUI State", lambda: make_request("GET", "/state")),
-    ]
+EXPLORATION_STEPS = [
+    ("Initial screen", []),
+    ("Press '?' for help", ["?"]),
+    ("Press '/' for chat", ["/"]),
+    ("Press 'p' for providers", ["p"]),
+    ("Press 'm' for models", ["m"]),
+    ("Press 'a' for agents", ["a"]),
+    ("Press 's' for sessions", ["s"]),
+    ("Press 't' for tools", ["t"]),
+    ("Press 'h' for schedules", ["h"]),
+    ("Press 'enter'", ["enter"]),
+    ("Press 'escape'", ["escape"]),
+    ("Press arrow keys", ["up", "down", "left", "right"]),
+    ("Press 'q' to quit", ["q"]),
+]
 
-    results = []
-    for name, test_fn in tests:
-        print(f"Testing: {name}...", end=" ", flush=True)
-        try:
-            result = test_fn()
-            if "error" in result:
-                print(f"FAIL - {result['error']}")
-                results.append((name, False, result["error"]))
-            else:
-                print("PASS")
-                results.append((name, True, None))
-        except Exception as e:
-            print(f"ERROR - {e}")
-            results.append((name, False, str(e)))
 
-    print()
-    print("=" * 60)
-    print("Test Results Summary")
-    print("=" * 60)
+def _encode_step(keys: list) -> tuple:
+    """Build the (path, body) request that sends one exploration step's keys."""
+    if len(keys) > 1:
+        # One round trip for the whole step; the server reports each key.
+        return "/keystrokes", _dumps({"keys": keys, "delay": 0})
+    if keys:
+        return "/keystroke", _dumps({"key": keys[0]})
+    return None, None
+
+
+# The steps never change, so their request bodies are encoded once.
+_EXPLORE_PAYLOADS = [(description, keys, *_encode_step(keys)) for description, keys in EXPLORATION_STEPS]
+
+
+class _Out:
+    """Collects report lines and writes them to stdout in one call."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def __call__(self, *args):
+        self._chunks.append(" ".join(map(str, args)) + "\n")
+
+    def flush(self):
+        sys.stdout.write("".join(self._chunks))
+        sys.stdout.flush()
+        self._chunks.clear()
+
+
+TEST_PROBES = [
+    ("Health Check", "/health"),
+    ("List Providers", "/providers"),
+    ("List Models", "/models"),
+    ("List Agents", "/agents"),
+    ("List Sessions", "/sessions"),
+    ("TUI Screen", "/screen"),
+    ("TUI State", "/state"),
+]
+
+
+def _test_outcome(name: str, result: dict = None, error: Exception = None) -> tuple:
+    """Grade one probe as (name, status text, (name, passed, error))."""
+    if error is not None:
+        return name, f"ERROR - {error}", (name, False, str(error))
+    if "error" in result:
+        return name, f"FAIL - {result['error']}", (name, False, result["error"])
+    return name, "PASS", (name, True, None)
+
+
+def _print_test_header():
+    out = _Out()
+    out("=" * 60)
+    out("Terminal AI Chat App - Test Suite")
+    out("=" * 60)
+    out()
+    out.flush()
+
+
+def _report_tests(outcomes) -> bool:
+    """Print each probe's outcome and the summary; True if all passed."""
+    results = []
+    for name, outcome, test_result in outcomes:
+        print(f"Testing: {name}... {outcome}", flush=True)
+        results.append(test_result)
+
+    # Progress lines above are live; the summary goes out in one write.
+    out = _Out()
+    out()
+    out("=" * 60)
+    out("Test Results Summary")
+    out("=" * 60)
     passed = sum(1 for _, p, _ in results if p)
     failed = len(results) - passed
-    print(f"Passed: {passed}/{len(results)}")
-    print(f"Failed: {failed}/{len(results)}")
-    print()
+    out(f"Passed: {passed}/{len(results)}")
+    out(f"Failed: {failed}/{len(results)}")
+    out()
 
     if failed > 0:
-        print("Failed tests:")
+        out("Failed tests:")
         for name, _, error in results:
             if error:
-                print(f"  - {name}: {error}")
+                out(f"  - {name}: {error}")
 
+    out.flush()
     return failed == 0
 
 
+def cmd_run_tests():
+    """Run comprehensive tests and report results."""
+    _print_test_header()
+
+    def run_test(probe):
+        name, path = probe
+        try:
+            return _test_outcome(name, make_request("GET", path))
+        except Exception as e:
+            return _test_outcome(name, error=e)
+
+    # The probes are independent, so run them at once; map keeps test order.
+    with ThreadPoolExecutor(max_workers=len(TEST_PROBES)) as executor:
+        return _report_tests(executor.map(run_test, TEST_PROBES))
+
+
+def cmd_run_tests_async():
+    """Run the test probes concurrently on one event loop with httpx."""
+    import httpx
+
+    async def run_test(client, name, path):
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                return _test_outcome(name, {"error": f"HTTP {response.status_code}: {response.text}"})
+            return _test_outcome(name, _loads(response.content))
+        except Exception as e:
+            return _test_outcome(name, error=e)
+
+    async def run_all():
+        async with httpx.AsyncClient(base_url=API_BASE, timeout=30) as client:
+            return await asyncio.gather(*(run_test(client, name, path) for name, path in TEST_PROBES))
+
+    _print_test_header()
+    return _report_tests(asyncio.run(run_all()))
+
+
 def cmd_ux_exploration():
     """
     Explore TUI UX by sending keystrokes and analyzing screen output.
     This simulates how a human would discover the interface.
     """
-    print("=" * 60)
-    print("TUI UX Exploration - AI Agent Style")
-    print("=" * 60)
-    print()
-    print("Simulating human exploration of the terminal interface...")
-    print()
-
-    exploration_steps = [
-        ("Initial screen", []),
-        ("Press '?' for help", ["?"]),
-        ("Press '/' for chat", ["/"]),
-        ("Press 'p' for providers", ["p"]),
-        ("Press 'm' for models", ["m"]),
-        ("Press 'a' for agents", ["a"]),
-        ("Press 's' for sessions", ["s"]),
-        ("Press 't' for tools", ["t"]),
-        ("Press 'h' for schedules", ["h"]),
-        ("Press 'enter'", ["enter"]),
-        ("Press 'escape'", ["escape"]),
-        ("Press arrow keys", ["up", "down", "left", "right"]),
-        ("Press 'q' to quit", ["q"]),
-    ]
+    out = _Out()
+    out("=" * 60)
+    out("TUI UX Exploration - AI Agent Style")
+    out("=" * 60)
+    out()
+    out("Simulating human exploration of the terminal interface...")
+    out()
 
     all_screens = []
-
-    for description, keys in exploration_steps:
-        print(f"Step: {description}")
-        if keys:
-            for key in keys:
-                result = make_request("POST", "/keystroke", {"key": key})
-                print(f"  Sent key '{key}': {result.get('success', 'N/A')}")
-                if not result.get("success", False):
-                    print(f"    Failed: {result.get('error', 'Unknown error')}")
-
-        screen_result = make_request("GET", "/screen")
-        screen = screen_result.get("screen", "")
+    screen = ""
+    screen_version = None
+
+    # Each step's report is written once the step finishes.
+    out.flush()
+    for description, keys, path, body in _EXPLORE_PAYLOADS:
+        out(f"Step: {description}")
+        key_results = []
+        if path:
+            result = _request_raw("POST", path, body)
+            if len(keys) > 1:
+                key_results = result.get("results") or [
+                    {"key": key, "success": False, "error": result.get("error")} for key in keys
+                ]
+            else:
+                key_results = [{**result, "key": keys[0]}]
+
+        for key_result in key_results:
+            out(f"  Sent key '{key_result['key']}': {key_result.get('success', 'N/A')}")
+            if not key_result.get("success", False):
+                out(f"    Failed: {key_result.get('error', 'Unknown error')}")
+
+        # Servers that version the screen skip resending text we already have.
+        if screen_version:
+            screen_result = make_request("GET", f"/screen?since={screen_version}")
+        else:
+            screen_result = make_request("GET", "/screen")
+        if not screen_result.get("unchanged"):
+            screen = screen_result.get("screen", "")
+        screen_version = screen_result.get("screen_version")
         if screen:
-            lines = screen.split("\n")
-            non_empty = [l for l in lines if l.strip()]
-            print(f"  Screen has {len(non_empty)} non-empty lines")
-            if len(non_empty) > 0:
-                print(f"  First line: {non_empty[0][:60]}...")
+            non_empty_count = sum(1 for line in screen.splitlines() if line and not line.isspace())
+            out(f"  Screen has {non_empty_count} non-empty lines")
+            if non_empty_count > 0:
+                first = next(line for line in screen.splitlines() if line and not line.isspace())
+                out(f"  First line: {first[:60]}...")
             all_screens.append((description, screen))
-        print()
+        out()
+        out.flush()
 
-    print("=" * 60)
-    print("UX Analysis Summary")
-    print("=" * 60)
-    print()
+    out("=" * 60)
+    out("UX Analysis Summary")
+    out("=" * 60)
+    out()
 
     issues = []
 
     for description, screen in all_screens:
-        if not screen.strip():
+        if not screen or screen.isspace():
             issues.append(f"{description}: Empty screen")
-        elif "error" in screen.lower() or "fail" in screen.lower():
+        elif _ISSUE_RE.search(screen):
             issues.append(f"{description}: Error message found")
 
     if issues:
-        print("Potential UX issues found:")
+        out("Potential UX issues found:")
         for issue in issues:
-            print(f"  - {issue}")
+            out(f"  - {issue}")
     else:
-        print("No obvious UX issues detected from screen analysis")
+        out("No obvious UX issues detected from screen analysis")
 
-    print()
-    print("Full screen captures saved for analysis:")
+    out()
+    out("Full screen captures saved for analysis:")
     for i, (description, _) in enumerate(all_screens[:5]):
-        print(f"  {i+1}. {description}")
-    print()
-    print("AI Agent can now analyze these screens to find UX problems!")
+        out(f"  {i+1}. {description}")
+    out()
+    out("AI Agent can now analyze these screens to find UX problems!")
+    out.flush()
 
     return len(issues) == 0
 
 
+# Command flag -> (options it requires, handler taking the parsed args).
+# Checked in order; the first flag given wins.
+COMMANDS = {
+    "health": ((), lambda a: cmd_health()),
+    "providers": ((), lambda a: cmd_list_providers()),
+    "models": ((), lambda a: cmd_list_models()),
+    "agents": ((), lambda a: cmd_list_agents()),
+    "sessions": ((), lambda a: cmd_list_sessions()),
+    "session": (("name", "provider", "model"),
+                lambda a: cmd_create_session(a.name, a.provider, a.model, a.agent)),
+    "chat": (("session_id", "message"), lambda a: cmd_chat(a.session_id, a.message)),
+    "stats": ((), lambda a: cmd_stats()),
+    "logs": ((), lambda a: cmd_api_logs()),
+    "test": ((), lambda a: cmd_run_tests()),
+    "test_async": ((), lambda a: cmd_run_tests_async()),
+    "explore": ((), lambda a: cmd_ux_exploration()),
+    "tui_screen": ((), lambda a: cmd_tui_screen()),
+    "tui_state": ((), lambda a: cmd_tui_state()),
+    "tui_key": (("key",), lambda a: cmd_tui_key(a.key)),
+    "tui_keys": (("keys",), lambda a: cmd_tui_keys(a.keys, a.delay)),
+}
+
+
+def _flag(dest: str) -> str:
+    """Command-line spelling of an argparse destination."""
+    return "--" + dest.replace("_", "-")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="AI Agent Test Client for Terminal AI Chat App",
@@ -308,6 +488,7 @@ Examples:
 
     # Run tests
     python test_api.py --test
+    python test_api.py --test-async           # Same probes via httpx.AsyncClient
 
     # AI UX exploration (simulates human testing)
     python test_api.py --explore
@@ -330,6 +511,7 @@ Examples:
     parser.add_argument("--stats", action="store_true", help="Get performance stats")
     parser.add_argument("--logs", action="store_true", help="Get API logs")
     parser.add_argument("--test", action="store_true", help="Run test suite")
+    parser.add_argument("--test-async", action="store_true", help="Run test suite concurrently with httpx")
     parser.add_argument("--explore", action="store_true", help="AI UX exploration")
     parser.add_argument("--tui-screen", action="store_true", help="Get TUI screen text")
     parser.add_argument("--tui-state", action="store_true", help="Get TUI state")
@@ -341,56 +523,17 @@ Examples:
 
     args = parser.parse_args()
 
-    if not any([args.health, args.providers, args.models, args.agents,
-                args.sessions, args.session, args.chat, args.stats, args.logs,
-                args.test, args.explore, args.tui_screen, args.tui_state,
-                args.tui_key, args.tui_keys]):
+    command = next((flag for flag in COMMANDS if getattr(args, flag)), None)
+    if command is None:
         parser.print_help()
         return
 
-    if args.health:
-        cmd_health()
-    elif args.providers:
-        cmd_list_providers()
-    elif args.models:
-        cmd_list_models()
-    elif args.agents:
-        cmd_list_agents()
-    elif args.sessions:
-        cmd_list_sessions()
-    elif args.session:
-        if not args.name or not args.provider or not args.model:
-            print("Error: --name, --provider, and --model required for --session")
-            return
-        cmd_create_session(args.name, args.provider, args.model, args.agent)
-    elif args.chat:
-        if not args.session_id or not args.message:
-            print("Error: --session-id and --message required for --chat")
-            return
-        cmd_chat(args.session_id, args.message)
-    elif args.stats:
-        cmd_stats()
-    elif args.logs:
-        cmd_api_logs()
-    elif args.test:
-        cmd_run_tests()
-    elif args.explore:
-        cmd_ux_exploration()
-    elif args.tui_screen:
-        cmd_tui_screen()
-    elif args.tui_state:
-        cmd_tui_state()
-    elif args.tui_key:
-        if not args.key:
-            print("Error: --key required for --tui-key")
-            return
-        cmd_tui_key(args.key)
-    elif args.tui_keys:
-        if not args.keys:
-            print("Error: --keys required for --tui-keys")
-            return
-        cmd_tui_keys(args.keys, args.delay)
-
+    required, handler = COMMANDS[command]
+    if not all(getattr(args, option) for option in required):
+        options = ", ".join(_flag(option) for option in required)
+        print(f"Error: {options} required for {_flag(command)}")
+        return
+    handler(args)
 
 if __name__ == "__main__":
     main()
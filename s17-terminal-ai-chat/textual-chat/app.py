@@ -1,11 +1,13 @@
 """Textual Chat App - Simple terminal chat with CRUD support."""
 
+from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Input, Static
 
-from datetime import datetime
-from typing import Dict, List
+import time
+from collections import deque
+from typing import Deque, Dict, List
 
 
 HELP_TEXT = """
@@ -30,22 +32,38 @@ HELP_TEXT = """
 ╚════════════════════════════════════════════════════════╝
 """
 
+# Built once so the help panel does not re-parse the text as markup.
+HELP_RENDERABLE = Text(HELP_TEXT)
+
+# Oldest chat lines are dropped beyond this many.
+MAX_CHAT_LINES = 1000
+
 
 class ChatPanel(Static):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.messages: List[Dict] = []
-        self._text_content = ""
+        self._lines: Deque[str] = deque(maxlen=MAX_CHAT_LINES)
+        self._stamp_second = -1
+        self._stamp = ""
+
+    def _timestamp(self) -> str:
+        """Local HH:MM:SS, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._stamp_second:
+            self._stamp_second = now
+            self._stamp = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._stamp
 
     def add_message(self, role: str, text: str, metadata: Dict = None):
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self._timestamp()
         role_emoji = "bot" if role == "assistant" else "you"
-        self._text_content += f"[{timestamp}] {role_emoji}: {text}\n"
-        self.update(self._text_content)
+        self._lines.append(f"[{timestamp}] {role_emoji}: {text}")
+        self.update("\n".join(self._lines))
 
     def clear(self):
         self.messages = []
-        self._text_content = ""
+        self._lines.clear()
         self.update("")
 
 
@@ -59,10 +77,41 @@ class ChatApp(App):
     #status-bar { height: auto; dock: bottom; background: $accent; color: $text; padding: 0 1; }
     """
 
+    # Status bar text per mode
+    _STATUS_HINTS = {
+        "chat": "MODE: Chat | SINGLE KEYS: /=chat p=providers m=models a=agents s=sessions t=tools h=schedules c=clear ?=help q=quit",
+        "providers": "MODE: Providers (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
+        "models": "MODE: Models (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
+        "agents": "MODE: Agents (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
+        "sessions": "MODE: Sessions (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
+        "tools": "MODE: Tools (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
+        "schedules": "MODE: Schedules (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
+    }
+
+    # Global single-key shortcuts: key -> action method name
+    _KEY_ACTIONS = {
+        "q": "action_quit",
+        "?": "action_toggle_help",
+        "/": "action_chat_mode",
+        "c": "action_clear_chat",
+        "escape": "action_chat_mode",
+    }
+
+    # Keys that switch to a section: key -> section name
+    _NAV_KEYS = {
+        "p": "providers",
+        "m": "models",
+        "a": "agents",
+        "s": "sessions",
+        "t": "tools",
+        "h": "schedules",
+    }
+
     def __init__(self):
         super().__init__()
         self.mode = "chat"
         self._help_visible = True
+        self._key_handlers = {key: getattr(self, name) for key, name in self._KEY_ACTIONS.items()}
 
     def compose(self) -> ComposeResult:
         with Horizontal(id="main"):
@@ -70,28 +119,21 @@ class ChatApp(App):
                 yield ChatPanel(id="chat")
                 yield Container(Input(placeholder="Click here, type, press ENTER", id="input"), id="input-area")
             with Vertical(id="help-panel"):
-                yield Static(HELP_TEXT, id="help-content")
+                yield Static(HELP_RENDERABLE, id="help-content")
         yield Static("MODE: Chat | SINGLE KEYS: / p m a s t h c ? q | Esc=back", id="status-bar")
 
     def on_mount(self) -> None:
+        self._status_bar = self.query_one("#status-bar", Static)
+        self._chat_panel = self.query_one("#chat", ChatPanel)
+        self._help_panel = self.query_one("#help-panel")
         self.update_status()
 
     def update_status(self):
-        hints = {
-            "chat": "MODE: Chat | SINGLE KEYS: /=chat p=providers m=models a=agents s=sessions t=tools h=schedules c=clear ?=help q=quit",
-            "providers": "MODE: Providers (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
-            "models": "MODE: Models (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
-            "agents": "MODE: Agents (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
-            "sessions": "MODE: Sessions (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
-            "tools": "MODE: Tools (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
-            "schedules": "MODE: Schedules (not implemented) | SINGLE KEYS: /=chat Esc=back q=quit",
-        }
-        self.query_one("#status-bar", Static).update(hints.get(self.mode, ""))
+        self._status_bar.update(self._STATUS_HINTS.get(self.mode, ""))
 
     def toggle_help(self):
         self._help_visible = not self._help_visible
-        help_panel = self.query_one("#help-panel")
-        help_panel.display = self._help_visible
+        self._help_panel.display = self._help_visible
 
     def action_toggle_help(self):
         self.toggle_help()
@@ -101,7 +143,7 @@ class ChatApp(App):
         self.update_status()
 
     def action_clear_chat(self):
-        self.query_one("#chat", ChatPanel).clear()
+        self._chat_panel.clear()
 
     def action_quit(self):
         self.exit()
@@ -113,44 +155,19 @@ class ChatApp(App):
 
     def on_key(self, event):
         """Handle keys globally before widgets get them."""
-        key = event.key
-        if key == "q":
-            self.action_quit()
-            event.stop()
-        elif key == "?":
-            self.action_toggle_help()
-            event.stop()
-        elif key == "/":
-            self.action_chat_mode()
-            event.stop()
-        elif key == "p":
-            self.action_nav("providers")
-            event.stop()
-        elif key == "m":
-            self.action_nav("models")
-            event.stop()
-        elif key == "a":
-            self.action_nav("agents")
-            event.stop()
-        elif key == "s":
-            self.action_nav("sessions")
-            event.stop()
-        elif key == "t":
-            self.action_nav("tools")
-            event.stop()
-        elif key == "h":
-            self.action_nav("schedules")
-            event.stop()
-        elif key == "c":
-            self.action_clear_chat()
+        handler = self._key_handlers.get(event.key)
+        if handler:
+            handler()
             event.stop()
-        elif key == "escape":
-            self.action_chat_mode()
+            return
+        section = self._NAV_KEYS.get(event.key)
+        if section:
+            self.action_nav(section)
             event.stop()
 
     def on_input_submitted(self, event: Input.Submitted):
         if event.value.strip() and self.mode == "chat":
-            chat = self.query_one("#chat", ChatPanel)
+            chat = self._chat_panel
             chat.add_message("user", event.value)
             chat.add_message("assistant", f"Echo: {event.value}")
             event.input.value = ""
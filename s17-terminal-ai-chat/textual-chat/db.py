@@ -1,26 +1,160 @@
 """Database module for Terminal AI Chat App."""
 
+import atexit
 import sqlite3
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 import json
 
 DATABASE_PATH = "chat_app.db"
 
+# Stored in PRAGMA user_version; bump it when init_db gains a data migration.
+SCHEMA_VERSION = 1
 
-def get_connection():
-    """Get database connection."""
-    conn = sqlite3.connect(DATABASE_PATH)
+# Per-connection tuning. synchronous=NORMAL is durable enough under WAL and
+# saves an fsync per commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+_wal_initialized = False
+
+# Lists and dicts are stored as JSON text, and columns declared "JSON TEXT"
+# (agents.tools, tools.parameters) are decoded back on read. TEXT in the
+# declaration keeps SQLite's text affinity.
+sqlite3.register_adapter(dict, json.dumps)
+sqlite3.register_adapter(list, json.dumps)
+
+
+def _json_value(value: Any) -> Any:
+    """Prepare a JSON column value; anything but a list or dict is encoded here."""
+    return value if isinstance(value, (list, dict)) else json.dumps(value)
+
+
+def _decode_json(value: bytes) -> Any:
+    """Decode a JSON column, keeping text that is not valid JSON as a string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value.decode("utf-8", "replace")
+
+
+sqlite3.register_converter("JSON", _decode_json)
+
+# One long-lived connection per thread, so the database, -wal and -shm files
+# are opened once rather than on every query.
+_local = threading.local()
+_open_connections: List[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+
+# Writers from all threads queue here rather than contending for SQLite's
+# write lock; reads take no lock, since WAL lets them run during a write.
+_write_lock = threading.Lock()
+
+# Guards the get_all() caches. Writers drop a cache under it only after
+# committing, so a get_all() that read rows before the write cannot store
+# them after the drop.
+_cache_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open and configure a new database connection."""
+    global _wal_initialized
+    conn = sqlite3.connect(
+        DATABASE_PATH, check_same_thread=False, cached_statements=256,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+    )
     conn.row_factory = sqlite3.Row
+    # WAL lets readers run alongside a writer; the mode is stored in the
+    # database file, so it only needs setting once per process.
+    if not _wal_initialized and DATABASE_PATH != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_initialized = True
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+def get_connection() -> sqlite3.Connection:
+    """Get this thread's database connection, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+        with _connections_lock:
+            _open_connections.append(conn)
+    return conn
+
+
+@atexit.register
+def _close_connections():
+    """Refresh planner statistics and close every thread's connection."""
+    with _connections_lock:
+        for conn in _open_connections:
+            try:
+                conn.execute("PRAGMA optimize")
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _open_connections.clear()
+    _local.__dict__.clear()
+
+
+def now_ms() -> int:
+    """Current time as Unix epoch milliseconds, the sessions timestamp format."""
+    return int(time.time() * 1000)
+
+
+# INSERT ... RETURNING (SQLite 3.35+) yields the new id from the insert itself.
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+
+def _insert(sql: str, params: tuple) -> int:
+    """Run an INSERT on this thread's connection, commit, and return the new row id."""
+    conn = get_connection()
+    # The connection outlives this call, so a failed insert (e.g. a duplicate
+    # name) must roll back rather than leave its transaction holding the lock.
+    with _write_lock, conn:
+        if HAS_RETURNING:
+            row_id = conn.execute(sql + " RETURNING id", params).fetchone()[0]
+        else:
+            row_id = conn.execute(sql, params).lastrowid
+    return row_id
+
+
+def _write(sql: str, params: tuple):
+    """Run an UPDATE or DELETE on this thread's connection and commit it."""
+    conn = get_connection()
+    with _write_lock, conn:
+        conn.execute(sql, params)
+
+
+@lru_cache(maxsize=256)
+def _build_update_sql(table: str, keys: tuple) -> str:
+    """
+    UPDATE statement for a table and sorted column names.
+
+    The same columns always produce the same SQL text, so sqlite3's
+    statement cache reuses the compiled statement.
+    """
+    set_clause = ", ".join(f"{k} = ?" for k in keys)
+    return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
+
 def init_db():
     """Initialize database tables."""
-    conn = get_connection()
-    cursor = conn.cursor()
+    # Schema setup runs on its own connection, before any shared ones exist.
+    conn = _connect()
+    # The whole schema runs as one script in a single transaction.
+    conn.executescript("""
+        BEGIN;
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS providers (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL UNIQUE,
@@ -29,10 +163,8 @@ def init_db():
             base_url TEXT,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+        );
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS models (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             provider_id INTEGER,
@@ -42,34 +174,29 @@ def init_db():
             cost_per_1k_tokens REAL DEFAULT 0.0,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (provider_id) REFERENCES providers(id)
-        )
-    """)
+        );
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS agents (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL UNIQUE,
             system_prompt TEXT,
             model_id INTEGER,
-            tools TEXT,
+            tools JSON TEXT,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (model_id) REFERENCES models(id)
-        )
-    """)
+        );
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS sessions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT,
             agent_id INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            -- Unix epoch milliseconds, which sort as compact integers.
+            created_at INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
+            updated_at INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
             FOREIGN KEY (agent_id) REFERENCES agents(id)
-        )
-    """)
+        );
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS messages (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id INTEGER NOT NULL,
@@ -81,22 +208,18 @@ def init_db():
             cost REAL DEFAULT 0.0,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (session_id) REFERENCES sessions(id)
-        )
-    """)
+        );
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS tools (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL UNIQUE,
             description TEXT,
             code TEXT NOT NULL,
-            parameters TEXT,
+            parameters JSON TEXT,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+        );
 
-    cursor.execute("""
         CREATE TABLE IF NOT EXISTS schedules (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL UNIQUE,
@@ -108,350 +231,388 @@ def init_db():
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (agent_id) REFERENCES agents(id)
-        )
+        );
+
+        -- (session_id, created_at) serves get_by_session's filter and order
+        -- without a sort step; the rest cover foreign-key lookups.
+        CREATE INDEX IF NOT EXISTS idx_messages_session_created ON messages(session_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_models_provider ON models(provider_id);
+        CREATE INDEX IF NOT EXISTS idx_agents_model ON agents(model_id);
+        CREATE INDEX IF NOT EXISTS idx_sessions_agent ON sessions(agent_id);
+        CREATE INDEX IF NOT EXISTS idx_schedules_agent ON schedules(agent_id);
+        CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at DESC);
+
+        COMMIT;
     """)
-
-    conn.commit()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        with conn:
+            _migrate_session_timestamps(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.close()
 
 
+def _migrate_session_timestamps(conn: sqlite3.Connection):
+    """Convert session timestamps written as ISO text into epoch milliseconds."""
+    # CURRENT_TIMESTAMP defaults are UTC ("YYYY-MM-DD HH:MM:SS"), while
+    # datetime.now().isoformat() values are local time with a "T" separator.
+    for column in ("created_at", "updated_at"):
+        conn.execute(f"""
+            UPDATE sessions SET {column} = CAST((
+                CASE WHEN {column} GLOB '*T*' THEN julianday({column}, 'utc') ELSE julianday({column}) END
+                - 2440587.5) * 86400000 AS INTEGER)
+            WHERE {column} GLOB '[0-9][0-9][0-9][0-9]-*'
+        """)
+
+
 class ProviderDB:
-    @staticmethod
-    def create(name: str, provider_type: str, api_key: str = None, base_url: str = None) -> int:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+    # Result of the last get_all(), dropped by every write.
+    _cache_all: Optional[List[sqlite3.Row]] = None
+
+    @classmethod
+    def create(cls, name: str, provider_type: str, api_key: str = None, base_url: str = None) -> int:
+        row_id = _insert(
             "INSERT INTO providers (name, provider_type, api_key, base_url) VALUES (?, ?, ?, ?)",
             (name, provider_type, api_key, base_url)
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        with _cache_lock:
+            cls._cache_all = None
+        return row_id
 
-    @staticmethod
-    def get_all() -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM providers ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+    @classmethod
+    def get_all(cls) -> List[sqlite3.Row]:
+        with _cache_lock:
+            if cls._cache_all is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM providers ORDER BY name")
+                cls._cache_all = cursor.fetchall()
+            return cls._cache_all
 
     @staticmethod
-    def get_by_id(id: int) -> Optional[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM providers WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return cursor.fetchone()
 
-    @staticmethod
-    def update(id: int, **kwargs):
+    @classmethod
+    def update(cls, id: int, **kwargs):
         allowed = ['name', 'provider_type', 'api_key', 'base_url']
         kwargs = {k: v for k, v in kwargs.items() if k in allowed}
         if not kwargs:
             return
         kwargs['updated_at'] = datetime.now().isoformat()
-        conn = get_connection()
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs])
-        cursor.execute(f"UPDATE providers SET {set_clause} WHERE id = ?", (*kwargs.values(), id))
-        conn.commit()
-        conn.close()
+        keys = tuple(sorted(kwargs))
+        _write(_build_update_sql("providers", keys), (*(kwargs[k] for k in keys), id))
+        with _cache_lock:
+            cls._cache_all = None
 
-    @staticmethod
-    def delete(id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM providers WHERE id = ?", (id,))
-        conn.commit()
-        conn.close()
+    @classmethod
+    def delete(cls, id: int):
+        _write("DELETE FROM providers WHERE id = ?", (id,))
+        with _cache_lock:
+            cls._cache_all = None
 
 
 class ModelDB:
-    @staticmethod
-    def create(provider_id: int, name: str, model_id: str, context_length: int = 4096, cost_per_1k_tokens: float = 0.0) -> int:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+    # Result of the last get_all(), dropped by every write.
+    _cache_all: Optional[List[sqlite3.Row]] = None
+
+    @classmethod
+    def create(cls, provider_id: int, name: str, model_id: str, context_length: int = 4096, cost_per_1k_tokens: float = 0.0) -> int:
+        row_id = _insert(
             "INSERT INTO models (provider_id, name, model_id, context_length, cost_per_1k_tokens) VALUES (?, ?, ?, ?, ?)",
             (provider_id, name, model_id, context_length, cost_per_1k_tokens)
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        with _cache_lock:
+            cls._cache_all = None
+        return row_id
 
-    @staticmethod
-    def get_all() -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM models ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+    @classmethod
+    def get_all(cls) -> List[sqlite3.Row]:
+        with _cache_lock:
+            if cls._cache_all is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM models ORDER BY name")
+                cls._cache_all = cursor.fetchall()
+            return cls._cache_all
 
     @staticmethod
-    def get_by_id(id: int) -> Optional[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM models WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return cursor.fetchone()
 
-    @staticmethod
-    def update(id: int, **kwargs):
+    @classmethod
+    def update(cls, id: int, **kwargs):
         allowed = ['provider_id', 'name', 'model_id', 'context_length', 'cost_per_1k_tokens']
         kwargs = {k: v for k, v in kwargs.items() if k in allowed}
         if not kwargs:
             return
-        conn = get_connection()
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs])
-        cursor.execute(f"UPDATE models SET {set_clause} WHERE id = ?", (*kwargs.values(), id))
-        conn.commit()
-        conn.close()
+        keys = tuple(sorted(kwargs))
+        _write(_build_update_sql("models", keys), (*(kwargs[k] for k in keys), id))
+        with _cache_lock:
+            cls._cache_all = None
 
-    @staticmethod
-    def delete(id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM models WHERE id = ?", (id,))
-        conn.commit()
-        conn.close()
+    @classmethod
+    def delete(cls, id: int):
+        _write("DELETE FROM models WHERE id = ?", (id,))
+        with _cache_lock:
+            cls._cache_all = None
 
 
 class AgentDB:
-    @staticmethod
-    def create(name: str, system_prompt: str = None, model_id: int = None, tools: List[str] = None) -> int:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+    # Result of the last get_all(), dropped by every write.
+    _cache_all: Optional[List[sqlite3.Row]] = None
+
+    @classmethod
+    def create(cls, name: str, system_prompt: str = None, model_id: int = None, tools: List[str] = None) -> int:
+        row_id = _insert(
             "INSERT INTO agents (name, system_prompt, model_id, tools) VALUES (?, ?, ?, ?)",
-            (name, system_prompt, model_id, json.dumps(tools or []))
+            (name, system_prompt, model_id, _json_value(tools or []))
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        with _cache_lock:
+            cls._cache_all = None
+        return row_id
 
-    @staticmethod
-    def get_all() -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM agents ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+    @classmethod
+    def get_all(cls) -> List[sqlite3.Row]:
+        with _cache_lock:
+            if cls._cache_all is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM agents ORDER BY name")
+                cls._cache_all = cursor.fetchall()
+            return cls._cache_all
 
     @staticmethod
-    def get_by_id(id: int) -> Optional[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM agents WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return cursor.fetchone()
 
-    @staticmethod
-    def update(id: int, **kwargs):
+    @classmethod
+    def update(cls, id: int, **kwargs):
         allowed = ['name', 'system_prompt', 'model_id', 'tools']
         kwargs = {k: v for k, v in kwargs.items() if k in allowed}
         if 'tools' in kwargs:
-            kwargs['tools'] = json.dumps(kwargs['tools'])
+            kwargs['tools'] = _json_value(kwargs['tools'])
         if not kwargs:
             return
         kwargs['updated_at'] = datetime.now().isoformat()
-        conn = get_connection()
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs])
-        cursor.execute(f"UPDATE agents SET {set_clause} WHERE id = ?", (*kwargs.values(), id))
-        conn.commit()
-        conn.close()
+        keys = tuple(sorted(kwargs))
+        _write(_build_update_sql("agents", keys), (*(kwargs[k] for k in keys), id))
+        with _cache_lock:
+            cls._cache_all = None
 
-    @staticmethod
-    def delete(id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM agents WHERE id = ?", (id,))
-        conn.commit()
-        conn.close()
+    @classmethod
+    def delete(cls, id: int):
+        _write("DELETE FROM agents WHERE id = ?", (id,))
+        with _cache_lock:
+            cls._cache_all = None
 
 
 class SessionDB:
-    @staticmethod
-    def create(name: str = None, agent_id: int = None) -> int:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO sessions (name, agent_id) VALUES (?, ?)",
-            (name, agent_id)
+    # Result of the last get_all(), dropped by every write.
+    _cache_all: Optional[List[sqlite3.Row]] = None
+
+    @classmethod
+    def create(cls, name: str = None, agent_id: int = None) -> int:
+        # Timestamps are set here too, as databases created before the switch
+        # to epoch milliseconds still default to CURRENT_TIMESTAMP text.
+        now = now_ms()
+        row_id = _insert(
+            "INSERT INTO sessions (name, agent_id, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (name, agent_id, now, now)
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        with _cache_lock:
+            cls._cache_all = None
+        return row_id
 
-    @staticmethod
-    def get_all() -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM sessions ORDER BY updated_at DESC")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+    @classmethod
+    def get_all(cls) -> List[sqlite3.Row]:
+        with _cache_lock:
+            if cls._cache_all is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM sessions ORDER BY updated_at DESC")
+                cls._cache_all = cursor.fetchall()
+            return cls._cache_all
 
     @staticmethod
-    def get_by_id(id: int) -> Optional[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM sessions WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return cursor.fetchone()
 
-    @staticmethod
-    def update(id: int, **kwargs):
+    @classmethod
+    def update(cls, id: int, **kwargs):
         allowed = ['name', 'agent_id']
         kwargs = {k: v for k, v in kwargs.items() if k in allowed}
         if not kwargs:
             return
-        kwargs['updated_at'] = datetime.now().isoformat()
-        conn = get_connection()
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs])
-        cursor.execute(f"UPDATE sessions SET {set_clause} WHERE id = ?", (*kwargs.values(), id))
-        conn.commit()
-        conn.close()
+        kwargs['updated_at'] = now_ms()
+        keys = tuple(sorted(kwargs))
+        _write(_build_update_sql("sessions", keys), (*(kwargs[k] for k in keys), id))
+        with _cache_lock:
+            cls._cache_all = None
 
-    @staticmethod
-    def delete(id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM sessions WHERE id = ?", (id,))
-        conn.commit()
-        conn.close()
+    @classmethod
+    def delete(cls, id: int):
+        _write("DELETE FROM sessions WHERE id = ?", (id,))
+        with _cache_lock:
+            cls._cache_all = None
 
 
 class MessageDB:
     @staticmethod
     def create(session_id: int, role: str, content: str, tokens_in: int = 0, tokens_out: int = 0, latency_ms: float = 0.0, cost: float = 0.0) -> int:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        return _insert(
             "INSERT INTO messages (session_id, role, content, tokens_in, tokens_out, latency_ms, cost) VALUES (?, ?, ?, ?, ?, ?, ?)",
             (session_id, role, content, tokens_in, tokens_out, latency_ms, cost)
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
 
     @staticmethod
-    def get_by_session(session_id: int) -> List[Dict]:
+    def create_many(rows: List[tuple]):
+        """
+        Insert several messages in one transaction.
+
+        Each row is (session_id, role, content, tokens_in, tokens_out,
+        latency_ms, cost), matching create()'s arguments.
+        """
         conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM messages WHERE session_id = ? ORDER BY created_at", (session_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        with _write_lock, conn:
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, content, tokens_in, tokens_out, latency_ms, cost) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
 
     @staticmethod
-    def delete_by_session(session_id: int):
+    def get_by_session(session_id: int) -> List[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
-        conn.commit()
-        conn.close()
-
+        cursor.execute("SELECT * FROM messages WHERE session_id = ? ORDER BY created_at", (session_id,))
+        return cursor.fetchall()
 
-class ToolDB:
     @staticmethod
-    def create(name: str, code: str, description: str = None, parameters: Dict = None) -> int:
+    def get_summaries_by_session(session_id: int, limit: int = 200, offset: int = 0) -> List[sqlite3.Row]:
+        """
+        Get a page of a session's messages for list views, newest first.
+
+        Rows have id, role and a preview of the first 60 characters of
+        content; use get_by_id for a full message.
+        """
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute(
-            "INSERT INTO tools (name, description, code, parameters) VALUES (?, ?, ?, ?)",
-            (name, description, code, json.dumps(parameters or {}))
+            "SELECT id, role, substr(content, 1, 60) AS preview FROM messages WHERE session_id = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            (session_id, limit, offset)
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        return cursor.fetchall()
 
     @staticmethod
-    def get_all() -> List[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tools ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        cursor.execute("SELECT * FROM messages WHERE id = ?", (id,))
+        return cursor.fetchone()
+
+    @staticmethod
+    def delete_by_session(session_id: int):
+        _write("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+
+class ToolDB:
+    # Result of the last get_all(), dropped by every write.
+    _cache_all: Optional[List[sqlite3.Row]] = None
+
+    @classmethod
+    def create(cls, name: str, code: str, description: str = None, parameters: Dict = None) -> int:
+        row_id = _insert(
+            "INSERT INTO tools (name, description, code, parameters) VALUES (?, ?, ?, ?)",
+            (name, description, code, _json_value(parameters or {}))
+        )
+        with _cache_lock:
+            cls._cache_all = None
+        return row_id
+
+    @classmethod
+    def get_all(cls) -> List[sqlite3.Row]:
+        with _cache_lock:
+            if cls._cache_all is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM tools ORDER BY name")
+                cls._cache_all = cursor.fetchall()
+            return cls._cache_all
 
     @staticmethod
-    def get_by_id(id: int) -> Optional[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM tools WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return cursor.fetchone()
 
-    @staticmethod
-    def update(id: int, **kwargs):
+    @classmethod
+    def update(cls, id: int, **kwargs):
         allowed = ['name', 'description', 'code', 'parameters']
         kwargs = {k: v for k, v in kwargs.items() if k in allowed}
         if 'parameters' in kwargs:
-            kwargs['parameters'] = json.dumps(kwargs['parameters'])
+            kwargs['parameters'] = _json_value(kwargs['parameters'])
         if not kwargs:
             return
         kwargs['updated_at'] = datetime.now().isoformat()
-        conn = get_connection()
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs])
-        cursor.execute(f"UPDATE tools SET {set_clause} WHERE id = ?", (*kwargs.values(), id))
-        conn.commit()
-        conn.close()
+        keys = tuple(sorted(kwargs))
+        _write(_build_update_sql("tools", keys), (*(kwargs[k] for k in keys), id))
+        with _cache_lock:
+            cls._cache_all = None
 
-    @staticmethod
-    def delete(id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tools WHERE id = ?", (id,))
-        conn.commit()
-        conn.close()
+    @classmethod
+    def delete(cls, id: int):
+        _write("DELETE FROM tools WHERE id = ?", (id,))
+        with _cache_lock:
+            cls._cache_all = None
 
 
 class ScheduleDB:
-    @staticmethod
-    def create(name: str, cron_expression: str, agent_id: int = None, enabled: bool = True) -> int:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+    # Result of the last get_all(), dropped by every write.
+    _cache_all: Optional[List[sqlite3.Row]] = None
+
+    @classmethod
+    def create(cls, name: str, cron_expression: str, agent_id: int = None, enabled: bool = True) -> int:
+        row_id = _insert(
             "INSERT INTO schedules (name, cron_expression, agent_id, enabled) VALUES (?, ?, ?, ?)",
             (name, cron_expression, agent_id, 1 if enabled else 0)
         )
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        with _cache_lock:
+            cls._cache_all = None
+        return row_id
 
-    @staticmethod
-    def get_all() -> List[Dict]:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM schedules ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+    @classmethod
+    def get_all(cls) -> List[sqlite3.Row]:
+        with _cache_lock:
+            if cls._cache_all is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM schedules ORDER BY name")
+                cls._cache_all = cursor.fetchall()
+            return cls._cache_all
 
     @staticmethod
-    def get_by_id(id: int) -> Optional[Dict]:
+    def get_by_id(id: int) -> Optional[sqlite3.Row]:
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM schedules WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return cursor.fetchone()
 
-    @staticmethod
-    def update(id: int, **kwargs):
+    @classmethod
+    def update(cls, id: int, **kwargs):
         allowed = ['name', 'cron_expression', 'agent_id', 'enabled', 'last_run', 'next_run']
         kwargs = {k: v for k, v in kwargs.items() if k in allowed}
         if 'enabled' in kwargs and isinstance(kwargs['enabled'], bool):
@@ -459,20 +620,16 @@ class ScheduleDB:
         if not kwargs:
             return
         kwargs['updated_at'] = datetime.now().isoformat()
-        conn = get_connection()
-        cursor = conn.cursor()
-        set_clause = ", ".join([f"{k} = ?" for k in kwargs])
-        cursor.execute(f"UPDATE schedules SET {set_clause} WHERE id = ?", (*kwargs.values(), id))
-        conn.commit()
-        conn.close()
-
-    @staticmethod
-    def delete(id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM schedules WHERE id = ?", (id,))
-        conn.commit()
-        conn.close()
+        keys = tuple(sorted(kwargs))
+        _write(_build_update_sql("schedules", keys), (*(kwargs[k] for k in keys), id))
+        with _cache_lock:
+            cls._cache_all = None
+
+    @classmethod
+    def delete(cls, id: int):
+        _write("DELETE FROM schedules WHERE id = ?", (id,))
+        with _cache_lock:
+            cls._cache_all = None
 
 
 if __name__ == "__main__":
@@ -1,29 +1,58 @@
 """CRUD panels for Terminal AI Chat App."""
 
+from datetime import datetime
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Input, Static, ListView, ListItem, Label, Button, Log
 from textual import events
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from db import (
     ProviderDB, ModelDB, AgentDB, SessionDB, ToolDB, ScheduleDB,
     init_db, get_connection
 )
 
 
+# Most recent messages ChatHistoryPanel lists for a session.
+HISTORY_PAGE_SIZE = 200
+
+# Edits within this many seconds of each other share one list refresh.
+REFRESH_DEBOUNCE = 0.05
+
+
+def _to_iso(ts) -> str:
+    """Local time text for an epoch-milliseconds timestamp; other values unchanged."""
+    try:
+        return datetime.fromtimestamp(int(ts) / 1000).isoformat(sep=" ", timespec="seconds")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return str(ts)
+
+
 class CRUDListPanel(Static):
     """Base class for CRUD list panels."""
 
+    # The title is drawn in the border rather than by a separate widget.
+    DEFAULT_CSS = """
+    CRUDListPanel { border: round $primary; border-title-align: center; }
+    """
+
+    # Columns format_detail shows after the ID, in display order; subclasses
+    # list their table's columns. Empty means every column of the row.
+    _detail_keys: Tuple[str, ...] = ()
+
+    # Columns holding epoch-milliseconds timestamps, shown as local time.
+    _epoch_keys: Tuple[str, ...] = ()
+
     def __init__(self, id: str, title: str, db_class, **kwargs):
         super().__init__(**kwargs)
         self.panel_id = id
         self.title = title
         self.db_class = db_class
+        self.border_title = title
         self.items: List[Dict] = []
         self.selected_index = 0
+        self._refresh_pending = False
 
     def compose(self) -> ComposeResult:
-        yield Static(f"=== {self.title} ===", id=f"{self.panel_id}-title")
         yield ListView(id=f"{self.panel_id}-list")
         yield Horizontal(
             Button("C", id=f"{self.panel_id}-btn-create", variant="primary"),
@@ -44,12 +73,24 @@ class CRUDListPanel(Static):
             self.items = self.db_class.get_all()
             list_view = self.query_one(f"#{self.panel_id}-list", ListView)
             list_view.clear()
-            for item in self.items:
-                label = self.get_item_label(item)
-                list_view.append(ListItem(Label(label), id=f"{self.panel_id}-item-{item['id']}"))
+            # One mount for all rows instead of a layout pass per append.
+            list_view.extend([
+                ListItem(Label(self.get_item_label(item)), id=f"{self.panel_id}-item-{item['id']}")
+                for item in self.items
+            ])
         except Exception as e:
             self.app.notify(f"Error loading {self.title}: {e}", severity="error")
 
+    def _schedule_refresh(self):
+        """Refresh items shortly, once for any number of calls in between."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.set_timer(REFRESH_DEBOUNCE, self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        self.refresh_items()
+
     def get_item_label(self, item: Dict) -> str:
         """Get display label for item. Override in subclass."""
         return str(item)
@@ -74,7 +115,7 @@ class CRUDListPanel(Static):
         try:
             self.db_class.create(name)
             input_widget.value = ""
-            self.refresh_items()
+            self._schedule_refresh()
             self.app.notify(f"{self.title[:-1]} created", severity="success")
         except Exception as e:
             self.app.notify(f"Error creating: {e}", severity="error")
@@ -91,11 +132,11 @@ class CRUDListPanel(Static):
 
     def format_detail(self, item: Dict) -> str:
         """Format item details for display."""
-        lines = [f"ID: {item['id']}"]
-        for k, v in item.items():
-            if k != 'id':
-                lines.append(f"{k}: {v}")
-        return "\n".join(lines)
+        keys = self._detail_keys or [k for k in item.keys() if k != 'id']
+        epoch_keys = self._epoch_keys
+        return f"ID: {item['id']}" + "".join(
+            f"\n{k}: {_to_iso(item[k]) if k in epoch_keys else item[k]}" for k in keys
+        )
 
     def action_update(self):
         """Update selected item."""
@@ -111,7 +152,7 @@ class CRUDListPanel(Static):
         try:
             self.db_class.update(item['id'], name=new_name)
             input_widget.value = ""
-            self.refresh_items()
+            self._schedule_refresh()
             self.app.notify(f"{self.title[:-1]} updated", severity="success")
         except Exception as e:
             self.app.notify(f"Error updating: {e}", severity="error")
@@ -124,7 +165,7 @@ class CRUDListPanel(Static):
             return
         try:
             self.db_class.delete(item['id'])
-            self.refresh_items()
+            self._schedule_refresh()
             self.app.notify(f"{self.title[:-1]} deleted", severity="success")
         except Exception as e:
             self.app.notify(f"Error deleting: {e}", severity="error")
@@ -133,6 +174,8 @@ class CRUDListPanel(Static):
 class ProvidersPanel(CRUDListPanel):
     """Providers CRUD panel."""
 
+    _detail_keys = ("name", "provider_type", "api_key", "base_url", "created_at", "updated_at")
+
     def __init__(self, **kwargs):
         super().__init__("providers", "Providers", ProviderDB, **kwargs)
 
@@ -143,6 +186,8 @@ class ProvidersPanel(CRUDListPanel):
 class ModelsPanel(CRUDListPanel):
     """Models CRUD panel."""
 
+    _detail_keys = ("provider_id", "name", "model_id", "context_length", "cost_per_1k_tokens", "created_at")
+
     def __init__(self, **kwargs):
         super().__init__("models", "Models", ModelDB, **kwargs)
 
@@ -153,6 +198,8 @@ class ModelsPanel(CRUDListPanel):
 class AgentsPanel(CRUDListPanel):
     """Agents CRUD panel."""
 
+    _detail_keys = ("name", "system_prompt", "model_id", "tools", "created_at", "updated_at")
+
     def __init__(self, **kwargs):
         super().__init__("agents", "Agents", AgentDB, **kwargs)
 
@@ -163,6 +210,9 @@ class AgentsPanel(CRUDListPanel):
 class SessionsPanel(CRUDListPanel):
     """Sessions CRUD panel."""
 
+    _detail_keys = ("name", "agent_id", "created_at", "updated_at")
+    _epoch_keys = ("created_at", "updated_at")
+
     def __init__(self, **kwargs):
         super().__init__("sessions", "Sessions", SessionDB, **kwargs)
 
@@ -174,6 +224,8 @@ class SessionsPanel(CRUDListPanel):
 class ToolsPanel(CRUDListPanel):
     """Tools CRUD panel."""
 
+    _detail_keys = ("name", "description", "code", "parameters", "created_at", "updated_at")
+
     def __init__(self, **kwargs):
         super().__init__("tools", "Tools", ToolDB, **kwargs)
 
@@ -184,6 +236,11 @@ class ToolsPanel(CRUDListPanel):
 class SchedulesPanel(CRUDListPanel):
     """Schedules CRUD panel."""
 
+    _detail_keys = (
+        "name", "cron_expression", "agent_id", "enabled", "last_run", "next_run",
+        "created_at", "updated_at"
+    )
+
     def __init__(self, **kwargs):
         super().__init__("schedules", "Schedules", ScheduleDB, **kwargs)
 
@@ -207,29 +264,45 @@ class ChatHistoryPanel(Static):
     def show_session(self, session_id: int):
         """Show messages for a session."""
         from db import MessageDB
-        self.messages = MessageDB.get_by_session(session_id)
+        # Only the latest page, and only a preview of each message's content;
+        # MessageDB.get_by_id loads a full message when one is needed.
+        self.messages = MessageDB.get_summaries_by_session(session_id, limit=HISTORY_PAGE_SIZE)[::-1]
         list_view = self.query_one("#chat-history-list", ListView)
         list_view.clear()
+        items = []
         for msg in self.messages:
             role = msg['role'][:4]
-            content = msg['content'][:40] + "..." if len(msg['content']) > 40 else msg['content']
-            list_view.append(ListItem(
+            preview = msg['preview']
+            content = preview[:40] + "..." if len(preview) > 40 else preview
+            items.append(ListItem(
                 Label(f"[{role}] {content}"),
                 id=f"msg-{msg['id']}"
             ))
+        list_view.extend(items)
 
 
 class SettingsPanel(Static):
     """Settings panel."""
 
+    # Field labels sit in the inputs' borders instead of separate widgets.
+    DEFAULT_CSS = """
+    SettingsPanel { border: round $primary; border-title-align: center; }
+    SettingsPanel Input { border-title-align: left; }
+    """
+
+    # (label, input id, placeholder, password)
+    _FIELDS = (
+        ("API Key", "settings-api-key", "Enter API key...", True),
+        ("Default Provider", "settings-provider", "Provider name...", False),
+        ("Theme", "settings-theme", "light/dark/auto...", False),
+    )
+
     def compose(self) -> ComposeResult:
-        yield Static("=== Settings ===", id="settings-title")
-        yield Static("API Key:", id="settings-api-key-label")
-        yield Input(password=True, placeholder="Enter API key...", id="settings-api-key")
-        yield Static("Default Provider:", id="settings-provider-label")
-        yield Input(placeholder="Provider name...", id="settings-provider")
-        yield Static("Theme:", id="settings-theme-label")
-        yield Input(placeholder="light/dark/auto...", id="settings-theme")
+        self.border_title = "Settings"
+        for label, input_id, placeholder, password in self._FIELDS:
+            field = Input(password=password, placeholder=placeholder, id=input_id)
+            field.border_title = label
+            yield field
         yield Button("Save Settings", id="settings-save", variant="primary")
 
 
@@ -6,38 +6,124 @@ screen output to identify UX issues.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import functools
+import socket
 import time
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 BASE = "http://localhost:8080"
 
+# One keep-alive session for every request; the pool covers the concurrent
+# endpoint probes.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Minimum gap between keys, so the TUI reads them as separate presses.
+KEYSTROKE_DELAY = 0.01
+
+# How long to wait for the TUI to settle after input, and how often to check.
+SETTLE_TIMEOUT = 1.0
+SETTLE_INTERVAL = 0.02
+
+def retry(times=2, backoff=0.05, on=(requests.RequestException, socket.timeout)):
+    """
+    Retry a function when it raises one of the given exceptions.
+
+    The pause doubles after each failure; the last failure is re-raised.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(times + 1):
+                try:
+                    return func(*args, **kwargs)
+                except on:
+                    if attempt == times:
+                        raise
+                    time.sleep(backoff * 2 ** attempt)
+        return wrapper
+    return decorator
+
+@retry()
+def _get(path):
+    """GET an API path, retrying transient failures."""
+    return SESSION.get(f"{BASE}{path}", timeout=2)
+
+# A keystroke may have been pressed even if its response was lost (a read
+# timeout or a reset after sending), so only retry when the connection
+# could not be opened in time and nothing was sent.
+@retry(on=(requests.exceptions.ConnectTimeout,))
+def _post(path, payload, timeout=2):
+    """POST JSON to an API path, retrying connect timeouts."""
+    return SESSION.post(f"{BASE}{path}", json=payload, timeout=timeout)
+
 def get_screen():
     """Get current TUI screen."""
     try:
-        r = requests.get(f"{BASE}/screen", timeout=2)
-        return r.json().get("screen", "")
-    except:
+        return _get("/screen").json().get("screen", "")
+    except (requests.RequestException, ValueError):
         return ""
 
 def get_state():
     """Get TUI state."""
     try:
-        r = requests.get(f"{BASE}/state", timeout=2)
-        return r.json()
-    except:
+        return _get("/state").json()
+    except (requests.RequestException, ValueError):
         return {"mode": "unknown", "running": False}
 
+def get_snapshot():
+    """Get TUI screen and state from one request."""
+    try:
+        r = _get("/snapshot")
+        if r.status_code != 404:
+            snapshot = r.json()
+            return snapshot.get("screen", ""), snapshot.get("state", {"mode": "unknown", "running": False})
+    except (requests.RequestException, ValueError):
+        return "", {"mode": "unknown", "running": False}
+
+    # Servers without /snapshot need separate requests.
+    return get_screen(), get_state()
+
 def send_key(key):
     """Send a keystroke to TUI."""
     try:
-        r = requests.post(f"{BASE}/keystroke", json={"key": key}, timeout=2)
-        return r.json()
-    except Exception as e:
+        return _post("/keystroke", {"key": key}).json()
+    except (requests.RequestException, ValueError) as e:
         return {"accepted": False, "error": str(e)}
 
-def send_keys(keys, delay=0.1):
-    """Send multiple keystrokes with delay."""
+def wait_until_settled(timeout=SETTLE_TIMEOUT, interval=SETTLE_INTERVAL):
+    """
+    Poll until the TUI has no queued keys and its screen stops changing.
+
+    Returns the last (screen, state); gives up after timeout.
+    """
+    deadline = time.monotonic() + timeout
+    screen, state = get_snapshot()
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        previous = screen
+        screen, state = get_snapshot()
+        if screen == previous and not state.get("queued_keys"):
+            break
+    return screen, state
+
+def send_keys(keys, delay=KEYSTROKE_DELAY):
+    """Send multiple keystrokes in one request; the server waits delay between keys."""
+    try:
+        r = _post("/keystrokes", {"keys": keys, "delay": delay},
+                  timeout=2 + delay * len(keys))
+        if r.status_code != 404:
+            body = r.json()
+            if "results" in body:
+                return [(result["key"], result) for result in body["results"]]
+            return [(key, body) for key in keys]
+    except (requests.RequestException, ValueError) as e:
+        return [(key, {"accepted": False, "error": str(e)}) for key in keys]
+
+    # Servers without the batch endpoint get one request per key.
     results = []
     for key in keys:
         result = send_key(key)
@@ -45,26 +131,37 @@ def send_keys(keys, delay=0.1):
         time.sleep(delay)
     return results
 
-def capture_screen_after(action_name, keys, delay=0.2):
-    """Execute action and capture screen."""
-    print(f"\n{'='*60}")
-    print(f"ACTION: {action_name}")
-    print(f"KEYS: {keys}")
-    print('='*60)
+def send_keys_traced(keys, delay=KEYSTROKE_DELAY):
+    """Send keystrokes in one request, getting the TUI state after each key.
 
+    Returns the per-key results, or None if the server cannot trace keys.
+    """
+    try:
+        r = _post("/keystrokes", {"keys": keys, "delay": delay, "trace": True},
+                  timeout=2 + (delay + SETTLE_TIMEOUT) * len(keys))
+        results = r.json().get("results", [])
+    except (requests.RequestException, ValueError):
+        return None
+    if results and all("state" in result for result in results):
+        return results
+    return None
+
+def capture_screen_after(action_name, keys, delay=KEYSTROKE_DELAY):
+    """Execute action and capture screen."""
     results = send_keys(keys, delay)
-    for key, result in results:
-        print(f"  {key}: {result}")
-
-    time.sleep(0.3)
-    screen = get_screen()
-    state = get_state()
-
-    print(f"\nSTATE: {state}")
-    print(f"\nSCREEN ({len(screen)} chars):")
-    print("-" * 40)
-    print(screen[:2000] if len(screen) > 2000 else screen)
-    print("-" * 40)
+    screen, state = wait_until_settled()
+
+    # The whole report goes out in one write.
+    lines = ["", "=" * 60, f"ACTION: {action_name}", f"KEYS: {keys}", "=" * 60]
+    lines.extend(f"  {key}: {result}" for key, result in results)
+    lines += [
+        "", f"STATE: {state}",
+        "", f"SCREEN ({len(screen)} chars):",
+        "-" * 40,
+        screen[:2000],
+        "-" * 40,
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return screen, state
 
@@ -80,8 +177,7 @@ def test_help_discovery():
     if "?" not in screen and "help" not in screen.lower():
         issues.append("No help hint visible on initial screen")
 
-    capture_screen_after("Press '?' for help", ["?"])
-    screen = get_screen()
+    screen, _ = capture_screen_after("Press '?' for help", ["?"])
     if "help" not in screen.lower() and "shortcut" not in screen.lower():
         issues.append("'?' key doesn't show help")
 
@@ -97,9 +193,8 @@ def test_chat_mode():
 
     capture_screen_after("Go to chat mode (/)", ["/"])
 
-    capture_screen_after("Type message", ["H", "e", "l", "l", "o", "enter"])
+    screen, _ = capture_screen_after("Type message", ["H", "e", "l", "l", "o", "enter"])
 
-    screen = get_screen()
     if "Hello" not in screen and "hello" not in screen:
         issues.append("Message not appearing in chat")
 
@@ -121,14 +216,27 @@ def test_navigation_shortcuts():
         ("h", "Schedules"),
     ]
 
+    names = dict(shortcuts)
+    expected = {key: name.lower() for key, name in shortcuts}
+
+    # Every shortcut is followed by '/' back to chat; one traced request
+    # reports the mode after each key.
+    keys = [k for key, _ in shortcuts for k in (key, "/")]
+    results = send_keys_traced(keys)
+    if results is not None:
+        lines = [f"KEYS: {keys}"]
+        for result in results[::2]:
+            key, state = result["key"], result["state"]
+            lines.append(f"  {key}: {state}")
+            if state.get("mode", "").lower() != expected[key]:
+                issues.append(f"'{key}' doesn't navigate to {names[key]} mode")
+        print("\n".join(lines))
+        return issues
+
+    # Servers without key tracing: one capture per shortcut.
     for key, name in shortcuts:
-        screen_before = get_screen()
-        state_before = get_state()
-
-        capture_screen_after(f"Press '{key}' for {name}", [key])
-
-        state = get_state()
-        if state.get("mode", "").lower() != name.lower():
+        _, state = capture_screen_after(f"Press '{key}' for {name}", [key])
+        if state.get("mode", "").lower() != expected[key]:
             issues.append(f"'{key}' doesn't navigate to {name} mode")
 
         capture_screen_after("Back to chat (/)", ["/"])
@@ -143,10 +251,7 @@ def test_keyboard_feedback():
 
     issues = []
 
-    capture_screen_after("Press random key 'x'", ["x"])
-    screen = get_screen()
-
-    state = get_state()
+    _, state = capture_screen_after("Press random key 'x'", ["x"])
     if not state.get("running"):
         issues.append("TUI not running")
 
@@ -186,13 +291,18 @@ def test_api_endpoints():
         "/state",
     ]
 
-    for endpoint in endpoints:
+    def probe(endpoint):
         try:
-            r = requests.get(f"{BASE}{endpoint}", timeout=2)
+            r = SESSION.get(f"{BASE}{endpoint}", timeout=2)
             if r.status_code != 200:
-                issues.append(f"Endpoint {endpoint} returned {r.status_code}")
+                return f"Endpoint {endpoint} returned {r.status_code}"
         except Exception as e:
-            issues.append(f"Endpoint {endpoint} failed: {e}")
+            return f"Endpoint {endpoint} failed: {e}"
+        return None
+
+    # The endpoints are independent, so probe them all at once.
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        issues.extend(issue for issue in executor.map(probe, endpoints) if issue)
 
     return issues
 
@@ -212,13 +322,13 @@ def test_crud_operations():
     }
 
     try:
-        r = requests.post(f"{BASE}/providers", json=provider_data, timeout=2)
+        r = SESSION.post(f"{BASE}/providers", json=provider_data, timeout=2)
         if r.status_code != 200:
             issues.append(f"Create provider failed: {r.status_code}")
         else:
             print("  ✓ Provider created")
 
-        r = requests.get(f"{BASE}/providers", timeout=2)
+        r = SESSION.get(f"{BASE}/providers", timeout=2)
         if r.status_code == 200:
             providers = r.json().get("providers", [])
             print(f"  ✓ Found {len(providers)} providers")
@@ -263,23 +373,22 @@ def run_exploration():
             print(f"\n✗ {name} test failed: {e}")
             all_issues.append(f"{name} test failed: {e}")
 
-    print("\n" + "="*60)
-    print("SUMMARY")
-    print("="*60)
-
+    lines = ["\n" + "="*60, "SUMMARY", "="*60]
     if all_issues:
-        print(f"\n{len(all_issues)} potential UX issues found:")
-        for i, issue in enumerate(all_issues, 1):
-            print(f"  {i}. {issue}")
+        lines.append(f"\n{len(all_issues)} potential UX issues found:")
+        lines.extend(f"  {i}. {issue}" for i, issue in enumerate(all_issues, 1))
     else:
-        print("\n✓ No UX issues found!")
-
-    print("\nRecommendations based on common UX issues:")
-    print("  1. Display keyboard shortcuts on initial screen")
-    print("  2. Show current mode in status bar")
-    print("  3. Provide visual feedback for all key presses")
-    print("  4. Make help discoverable (press ? or show hints)")
-    print("  5. Include example commands or usage hints")
+        lines.append("\n✓ No UX issues found!")
+
+    lines += [
+        "\nRecommendations based on common UX issues:",
+        "  1. Display keyboard shortcuts on initial screen",
+        "  2. Show current mode in status bar",
+        "  3. Provide visual feedback for all key presses",
+        "  4. Make help discoverable (press ? or show hints)",
+        "  5. Include example commands or usage hints",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return all_issues
 
@@ -1,11 +1,66 @@
 """Tool implementation."""
 
+import ast
+import contextlib
+import io
 import json
+import operator
+import os
+import re
 import subprocess
+from functools import lru_cache
 from typing import Dict, Any, List
 
 from tools.base import ToolBase
 
+# DuckDuckGo result snippets, matched on the raw page bytes.
+_SNIPPET_RE = re.compile(rb'<a class="result__snippet"[^>]*>([^<]*)</a>')
+MAX_SNIPPETS = 5
+# The page is read in chunks; the unmatched tail of each chunk is kept in
+# case a snippet straddles the boundary.
+_SEARCH_CHUNK_SIZE = 65536
+_SEARCH_TAIL_SIZE = 4096
+
+# Characters FileReadTool returns before truncating.
+MAX_READ_LENGTH = 10000
+
+# FileWriteTool payloads below this many bytes go straight to os.write.
+SMALL_WRITE_SIZE = 8192
+
+# Operators the calculator evaluates.
+_ALLOWED_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+@lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.expr:
+    """Parse an expression once; agents often repeat the same calculation."""
+    return ast.parse(expression, mode='eval').body
+
+
+def _eval_expression(node: ast.expr):
+    """Evaluate an arithmetic expression tree."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _ALLOWED_OPS:
+        return _ALLOWED_OPS[type(node.op)](_eval_expression(node.left), _eval_expression(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _ALLOWED_OPS:
+        return _ALLOWED_OPS[type(node.op)](_eval_expression(node.operand))
+    raise TypeError(f"Unsupported expression: {ast.dump(node)}")
+
+
+@lru_cache(maxsize=128)
+def _compile_code(code: str):
+    """Compile a REPL snippet once; tool-call loops often rerun the same code."""
+    return compile(code, '<repl>', 'exec')
+
 
 class PythonREPLTool(ToolBase):
     """Python REPL tool for code execution."""
@@ -23,30 +78,12 @@ class PythonREPLTool(ToolBase):
             return "No code provided"
         
         try:
-            import builtins
-            output = []
-            
-            class OutputCapture:
-                def write(self, text):
-                    output.append(text)
-                
-                def flush(self):
-                    pass
-            
-            old_stdout = builtins.stdout
-            old_stderr = builtins.stderr
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                exec(_compile_code(code), {})
+            result = stdout.getvalue() + stderr.getvalue()
+            return result if result else "Code executed successfully (no output)"
             
-            builtins.stdout = OutputCapture()
-            builtins.stderr = OutputCapture()
-            
-            try:
-                exec(code, {})
-                result = "".join(output)
-                return result if result else "Code executed successfully (no output)"
-            finally:
-                builtins.stdout = old_stdout
-                builtins.stderr = old_stderr
-                
         except Exception as e:
             return f"Error: {str(e)}"
     
@@ -142,19 +179,27 @@ class WebSearchTool(ToolBase):
                 "User-Agent": "Mozilla/5.0"
             })
             
+            snippets = []
             with urllib.request.urlopen(req, timeout=10) as response:
-                content = response.read().decode("utf-8")
-                
-                import re
-                snippets = re.findall(r'<a class="result__snippet"[^>]*>([^<]*)</a>', content)
-                
-                if snippets:
-                    results = []
-                    for i, snippet in enumerate(snippets[:5]):
-                        results.append(f"{i+1}. {snippet.strip()}")
-                    return "\n".join(results)
-                else:
-                    return "No results found"
+                # Stop downloading as soon as enough snippets are found.
+                buffer = b""
+                while len(snippets) < MAX_SNIPPETS:
+                    chunk = response.read(_SEARCH_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    end = 0
+                    for match in _SNIPPET_RE.finditer(buffer):
+                        snippets.append(match.group(1).decode("utf-8", "replace").strip())
+                        end = match.end()
+                        if len(snippets) >= MAX_SNIPPETS:
+                            break
+                    buffer = buffer[max(end, len(buffer) - _SEARCH_TAIL_SIZE):]
+            
+            if snippets:
+                return "\n".join(f"{i+1}. {snippet}" for i, snippet in enumerate(snippets))
+            else:
+                return "No results found"
                     
         except Exception as e:
             return f"Error searching: {str(e)}"
@@ -189,12 +234,12 @@ class FileReadTool(ToolBase):
             return "No path provided"
         
         try:
+            # Read only what is returned; the rest of a large file is never loaded.
             with open(path, 'r') as f:
-                content = f.read()
-            
-            max_length = 10000
-            if len(content) > max_length:
-                content = content[:max_length] + f"\n... ({len(content) - max_length} more characters)"
+                content = f.read(MAX_READ_LENGTH)
+                if f.read(1):
+                    remaining = os.fstat(f.fileno()).st_size - len(content.encode(f.encoding))
+                    content += f"\n... (about {remaining} more bytes)"
             
             return content
             
@@ -235,8 +280,20 @@ class FileWriteTool(ToolBase):
             return "No path provided"
         
         try:
-            with open(path, 'w') as f:
-                f.write(content)
+            data = content.encode("utf-8")
+            if len(data) < SMALL_WRITE_SIZE:
+                # Small files skip the file object layers: open, write, close.
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+            else:
+                # One binary write, without text-layer encoding in chunks.
+                with open(path, 'wb') as f:
+                    f.write(data)
             
             return f"Successfully wrote to {path}"
             
@@ -277,33 +334,7 @@ class CalculatorTool(ToolBase):
             return "No expression provided"
         
         try:
-            import ast
-            import operator
-            
-            allowed_ops = {
-                ast.Add: operator.add,
-                ast.Sub: operator.sub,
-                ast.Mult: operator.mul,
-                ast.Div: operator.truediv,
-                ast.Pow: operator.pow,
-                ast.USub: operator.neg,
-                ast.UAdd: operator.pos,
-            }
-            
-            def eval_expr(node):
-                if isinstance(node, ast.Num):
-                    return node.n
-                elif isinstance(node, ast.BinOp):
-                    if type(node.op) in allowed_ops:
-                        return allowed_ops[type(node.op)](eval_expr(node.left), eval_expr(node.right))
-                elif isinstance(node, ast.UnaryOp):
-                    if type(node.op) in allowed_ops:
-                        return allowed_ops[type(node.op)](eval_expr(node.operand))
-                else:
-                    raise TypeError(f"Unsupported expression: {ast.dump(node)}")
-            
-            result = eval_expr(ast.parse(expression, mode='eval').body)
-            return str(result)
+            return str(_eval_expression(_parse_expression(expression)))
             
         except Exception as e:
             return f"Error evaluating expression: {str(e)}"
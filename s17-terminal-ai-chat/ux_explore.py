@@ -3,32 +3,61 @@
 UX exploration script that generates a CSV report of issues found.
 """
 
+import hashlib
+import http.client
 import json
-import urllib.request
-import urllib.error
+import re
 import csv
+import os
 import sys
 from datetime import datetime
+from urllib.parse import urlsplit
 
 API_BASE = "http://localhost:8080"
 
+# One keep-alive connection shared by every request of the exploration.
+_API_URL = urlsplit(API_BASE)
+_CONN = http.client.HTTPConnection(_API_URL.hostname, _API_URL.port, timeout=30)
+
+# Errors from a kept-alive connection the server closed before replying.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# ANSI escape codes: CSI sequences (colors, cursor moves) and OSC sequences.
+_ANSI_RE = re.compile(r'\x1b(?:\[[0-9;]*[a-zA-Z]|\][0-9;]*[^\x1b])')
+
+# Words that show the screen has a status or mode indicator.
+_STATUS_RE = re.compile(r'mode|status|chat|provider|model|agent')
+
+# Screens repeat across test cases (e.g. help opened twice), so their issues
+# are cached by a hash of the screen text.
+_ANALYZE_CACHE = {}
+
 
 def make_request(method: str, path: str, data: dict = None) -> dict:
     """Make HTTP request to API server."""
-    url = f"{API_BASE}{path}"
     headers = {"Content-Type": "application/json"}
-
-    req = urllib.request.Request(url, method=method, headers=headers)
-    if data:
-        req.data = json.dumps(data).encode()
-
-    try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        return {"error": f"HTTP {e.code}: {e.read().decode()}"}
-    except urllib.error.URLError as e:
-        return {"error": f"Connection failed: {e}"}
+    body = json.dumps(data).encode() if data else None
+
+    # The server may have closed the kept-alive connection; reconnect once.
+    # Timeouts and other failures are not retried: the server may already
+    # have handled the request, and a keystroke would be sent twice.
+    for attempt in range(2):
+        try:
+            _CONN.request(method, path, body, headers)
+            response = _CONN.getresponse()
+            payload = response.read()
+            break
+        except _STALE_CONNECTION_ERRORS as e:
+            _CONN.close()
+            if attempt:
+                return {"error": f"Connection failed: {e}"}
+        except (http.client.HTTPException, OSError) as e:
+            _CONN.close()
+            return {"error": f"Connection failed: {e}"}
+
+    if response.status >= 400:
+        return {"error": f"HTTP {response.status}: {payload.decode()}"}
+    return json.loads(payload)
 
 
 def send_key(key: str) -> bool:
@@ -51,56 +80,44 @@ def get_state() -> dict:
 
 def extract_visible_text(screen: str) -> list:
     """Extract visible text lines from screen (filter out escape codes)."""
-    lines = screen.split("\n")
-    visible_lines = []
-    for line in lines:
-        # Filter out ANSI escape codes
-        import re
-        clean_line = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', line)
-        clean_line = re.sub(r'\x1b\[[0-9;]*[HfABCDsuJK]', '', clean_line)
-        clean_line = re.sub(r'\x1b\][0-9;]*[^\x1b]', '', clean_line)
-        clean_line = clean_line.strip()
-        if clean_line:
-            visible_lines.append(clean_line)
-    return visible_lines
+    cleaned = (_ANSI_RE.sub('', line).strip() for line in screen.split("\n"))
+    return [line for line in cleaned if line]
 
 
-def analyze_screen(screen: str, action: str) -> list:
-    """Analyze screen for issues."""
-    issues = []
+def _screen_issues(screen: str) -> tuple:
+    """(issue, severity, suggestion) triples for a screen, computed once per distinct screen."""
+    key = hashlib.blake2b(screen.encode(), digest_size=16).digest()
+    found = _ANALYZE_CACHE.get(key)
+    if found is not None:
+        return found
+
     visible = extract_visible_text(screen)
+    text = ' '.join(visible).lower()
+    found = []
 
     # Check for help
-    if 'help' not in ' '.join(visible).lower():
-        issues.append({
-            'action': action,
-            'issue': 'No help visible on screen',
-            'severity': 'high',
-            'suggestion': 'Add help text or visible shortcuts'
-        })
+    if 'help' not in text:
+        found.append(('No help visible on screen', 'high', 'Add help text or visible shortcuts'))
 
     # Check for shortcuts hints
-    if 'press' not in ' '.join(visible).lower():
-        issues.append({
-            'action': action,
-            'issue': 'No keyboard shortcuts hints',
-            'severity': 'medium',
-            'suggestion': 'Show available shortcuts (e.g., "Press ? for help")'
-        })
+    if 'press' not in text:
+        found.append(('No keyboard shortcuts hints', 'medium',
+                      'Show available shortcuts (e.g., "Press ? for help")'))
 
     # Check for status/mode indicator
-    status_indicators = ['mode', 'status', 'chat', 'provider', 'model', 'agent']
-    has_status = any(ind in ' '.join(visible).lower() for ind in status_indicators)
+    if visible and not _STATUS_RE.search(text):
+        found.append(('No status/mode indicator visible', 'low', 'Show current mode in status bar'))
+
+    found = _ANALYZE_CACHE[key] = tuple(found)
+    return found
 
-    if not has_status and visible:
-        issues.append({
-            'action': action,
-            'issue': 'No status/mode indicator visible',
-            'severity': 'low',
-            'suggestion': 'Show current mode in status bar'
-        })
 
-    return issues
+def analyze_screen(screen: str, action: str) -> list:
+    """Analyze screen for issues."""
+    return [
+        {'action': action, 'issue': issue, 'severity': severity, 'suggestion': suggestion}
+        for issue, severity, suggestion in _screen_issues(screen)
+    ]
 
 
 def run_exploration():
@@ -167,21 +184,20 @@ def run_exploration():
             seen.add(key)
             unique_issues.append(issue)
 
-    # Write CSV
+    # Sort by severity
+    severity_order = {'high': 1, 'medium': 2, 'low': 3}
+    sorted_issues = sorted(unique_issues, key=lambda x: severity_order.get(x['severity'], 4))
+    rows = [(i['severity'], i['action'], i['issue'], i['suggestion']) for i in sorted_issues]
+
+    # Write CSV to a temporary file and swap it in, so a failed run never
+    # leaves a half-written report. csv quotes fields containing commas.
     csv_file = '/home/vuos/code/p3/s17/ux_issues.csv'
-    with open(csv_file, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['severity', 'action', 'issue', 'suggestion'])
-        writer.writeheader()
-
-        # Sort by severity
-        severity_order = {'high': 1, 'medium': 2, 'low': 3}
-        sorted_issues = sorted(unique_issues, key=lambda x: severity_order.get(x['severity'], 4))
-
-        for issue in sorted_issues:
-            # Escape commas in fields
-            for field in ['action', 'issue', 'suggestion']:
-                issue[field] = issue[field].replace(',', ';')
-            writer.writerow(issue)
+    tmp_file = f"{csv_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['severity', 'action', 'issue', 'suggestion'])
+        writer.writerows(rows)
+    os.replace(tmp_file, csv_file)
 
     print(f"\nCSV report saved to: {csv_file}")
     print()